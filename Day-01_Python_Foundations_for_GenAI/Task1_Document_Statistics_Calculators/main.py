@@ -1,49 +1,86 @@
 import os
+import sys
+import time
 
-def calculate_document_statistics(file_path):
+BLOCK_SIZE = 1 << 20  # characters per read (~1 MiB of ASCII)
+
+# Whitespace as str.split() sees it in ASCII → b" ", everything else → b"x".
+# A word starts wherever b" x" appears, so counting words is one bytes.count.
+WORD_MASK = bytes(
+    0x20 if chr(b).isspace() else 0x78 for b in range(128)
+) + b"x" * 128
+
+
+def stream_document_statistics(file_path, block_size=BLOCK_SIZE):
+    """
+    Count lines, words, characters and sentence terminators in one pass
+    over fixed-size blocks of the decoded text.
+
+    Returns the same result dict as DocumentManager.calculate_document_statistics:
+    the file is read in text mode (so '\r' and '\r\n' become '\n'), lines are
+    '\n'-separated (an empty file has 1 line), words are str.split() words
+    and characters exclude the '\n' line breaks. ASCII blocks count words
+    with a bytes.translate mask; other blocks fall back to str.split().
+    """
     if not os.path.isfile(file_path):
         raise FileNotFoundError(f"The file at {file_path} does not exist.")
-    
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-        print("Document Content:")
-        # print(content)
-        line_count = 0
-        total_word_count = 0
-        total_char_count = 0
-        total_sentense_splitby_dot = 0
-        total_sentense_splitby_exclamation = 0
-        total_sentense_splitby_question = 0
-        # Total sentences (split by ., !, ?)
-        for line in content.split('\n'):
-            for chr in line:
-                total_char_count += 1
-            # print(line)
-            line_count += 1
-            word_count = line.split(' ')
-            # print(word_count)
-            total_word_count += len(word_count)
-            sentense_splitby_dot = line.split('.')
-            sentense_splitby_exclamation = line.split('!')
-            sentense_splitby_question = line.split('?')
-            total_sentense_splitby_dot += len(sentense_splitby_dot) - 1
-            total_sentense_splitby_exclamation += len(sentense_splitby_exclamation) - 1
-            total_sentense_splitby_question += len(sentense_splitby_question) - 1
-
-            
-            print(f"Line {line_count} has {len(word_count)} words.")
-        print("\nDocument Statistics:")
-        print(f"Total Lines: {line_count}")
-        print(f"Total Words: {total_word_count}")
-        print(f"Total Characters: {total_char_count}")
-        print(f"Total Sentences (by '.'): {total_sentense_splitby_dot}")
-        print(f"Total Sentences (by '!'): {total_sentense_splitby_exclamation}")
-        print(f"Total Sentences (by '?'): {total_sentense_splitby_question}")
-        total_sentences = (total_sentense_splitby_dot + 
-                           total_sentense_splitby_exclamation + 
-                           total_sentense_splitby_question)
-        print(f"Total Sentences: {total_sentences}")
-
-
-
-calculate_document_statistics("./sample.txt")
\ No newline at end of file
+
+    newlines = words = chars = 0
+    dots = exclamations = questions = 0
+    prev_space = True  # whether the previous block ended in whitespace
+
+    with open(file_path, "r", encoding="utf-8") as file:
+        for block in iter(lambda: file.read(block_size), ""):
+            newlines += block.count("\n")
+            chars += len(block)
+
+            dots += block.count(".")
+            exclamations += block.count("!")
+            questions += block.count("?")
+
+            # A word split across blocks is only counted where it started
+            if block.isascii():
+                mask = ((b" " if prev_space else b"x") + block.encode("ascii")).translate(WORD_MASK)
+                words += mask.count(b" x")
+            else:
+                words += len(block.split())
+                if not prev_space and not block[0].isspace():
+                    words -= 1
+
+            prev_space = block[-1].isspace()
+
+    total_sentences = dots + exclamations + questions
+
+    return {
+        "total_lines": newlines + 1,
+        "total_words": words,
+        "total_characters": chars - newlines,
+        "total_sentences_by_dot": dots,
+        "total_sentences_by_exclamation": exclamations,
+        "total_sentences_by_question": questions,
+        "total_sentences": total_sentences
+    }
+
+
+def calculate_document_statistics(file_path):
+    start = time.perf_counter()
+    stats = stream_document_statistics(file_path)
+    elapsed = time.perf_counter() - start
+
+    size_mb = os.path.getsize(file_path) / (1024 * 1024)
+    print("\nDocument Statistics:")
+    print(f"Total Lines: {stats['total_lines']}")
+    print(f"Total Words: {stats['total_words']}")
+    print(f"Total Characters: {stats['total_characters']}")
+    print(f"Total Sentences (by '.'): {stats['total_sentences_by_dot']}")
+    print(f"Total Sentences (by '!'): {stats['total_sentences_by_exclamation']}")
+    print(f"Total Sentences (by '?'): {stats['total_sentences_by_question']}")
+    print(f"Total Sentences: {stats['total_sentences']}")
+    if elapsed > 0:
+        print(f"Processed {size_mb:.2f} MB in {elapsed:.3f}s ({size_mb / elapsed:.1f} MB/s)")
+
+    return stats
+
+
+if __name__ == "__main__":
+    calculate_document_statistics(sys.argv[1] if len(sys.argv) > 1 else "./sample.txt")
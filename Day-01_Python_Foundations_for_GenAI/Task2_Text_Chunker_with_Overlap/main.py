@@ -1,41 +1,146 @@
 import os
+import sys
+import time
+import tracemalloc
 
-def chunk_with_overlap(file_path):
+
+def iter_windows(text_length, chunk_size=10, overlap_size=3):
+    """
+    Lazily yield (chunk_id, start, end) character windows over a text of
+    text_length characters. Every window is chunk_size long except the
+    last, which ends exactly at text_length.
+    """
+    if overlap_size >= chunk_size:
+        raise ValueError("overlap_size must be smaller than chunk_size")
+
+    step = chunk_size - overlap_size
+    chunk_id = 0
+    start = 0
+    while start < text_length:
+        end = min(start + chunk_size, text_length)
+        yield chunk_id, start, end
+        if end == text_length:
+            break
+        chunk_id += 1
+        start += step
+
+
+def iter_stream_chunks(stream, chunk_size=10, overlap_size=3, read_size=1 << 16):
+    """
+    Yield (chunk_id, start, end, text) over a text stream in constant memory.
+
+    Only the unread tail of the current window is buffered, so multi-MB
+    files never have to be loaded whole. Windows and offsets are identical
+    to iter_windows over the full text.
+    """
+    if overlap_size >= chunk_size:
+        raise ValueError("overlap_size must be smaller than chunk_size")
+
+    step = chunk_size - overlap_size
+    buffer = ""
+    buffer_start = 0  # offset of buffer[0] in the whole stream
+    chunk_id = 0
+    start = 0
+    last_end = 0
+
+    for piece in iter(lambda: stream.read(read_size), ""):
+        buffer += piece
+        while start + chunk_size <= buffer_start + len(buffer):
+            i = start - buffer_start
+            yield chunk_id, start, start + chunk_size, buffer[i:i + chunk_size]
+            last_end = start + chunk_size
+            chunk_id += 1
+            start += step
+
+        buffer = buffer[start - buffer_start:]
+        buffer_start = start
+
+    total_length = buffer_start + len(buffer)
+    if start < total_length and (chunk_id == 0 or last_end < total_length):
+        yield chunk_id, start, total_length, buffer
+
+
+def chunk_with_overlap(file_path, chunk_size=10, overlap_size=3):
     if not os.path.isfile(file_path):
         raise FileNotFoundError(f"The file at {file_path} does not exist.")
-    
+
     with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-        print("Document Content:")
-
-        for line in content.split('\n'):
-            line_length = len(line)
-            # print(f"Processing line of length {line_length}: {line}")
-            chunk_size = 10
-            overlap_size = 3
-            start = 0
-            chunk_count = 0
-            chunk_text = ""
-            chunk_id = 0
-            chunk_text = []
-            while start < line_length:
-                end = min(start + chunk_size, line_length)
-                chunk = line[start:end]
-                chunk_count += 1
-                # chunk_text.append(chunk)
-                # print(f"Chunk {chunk_count}: {chunk}")
-                if end == line_length:
-                    break
-                start += (chunk_size - overlap_size)
-                chunk_text.append({
-                    'chunk_id': chunk_id,
-                    'text': chunk,
-                    'start_pos': start,
-                    'end_pos': end,
-                    'word_count': len(chunk.split())
-                })
-            # print(chunk_count)
-            print(chunk_text)
-
-
-chunk_with_overlap("./sample.txt")
\ No newline at end of file
+        for chunk_id, start, end, text in iter_stream_chunks(file, chunk_size, overlap_size):
+            yield {
+                'chunk_id': chunk_id,
+                'text': text,
+                'start_pos': start,
+                'end_pos': end,
+                'word_count': len(text.split())
+            }
+
+
+def _per_line_chunk_loop(content, chunk_size=10, overlap_size=3):
+    # The original per-line loop (without its prints), kept as the benchmark baseline
+    chunks = []
+    for line in content.split('\n'):
+        line_length = len(line)
+        start = 0
+        chunk_id = 0
+        chunk_text = []
+        while start < line_length:
+            end = min(start + chunk_size, line_length)
+            chunk = line[start:end]
+            if end == line_length:
+                break
+            start += (chunk_size - overlap_size)
+            chunk_text.append({
+                'chunk_id': chunk_id,
+                'text': chunk,
+                'start_pos': start,
+                'end_pos': end,
+                'word_count': len(chunk.split())
+            })
+        chunks.append(chunk_text)
+    return chunks
+
+
+def benchmark_chunkers(file_path, chunk_size=10, overlap_size=3, repeats=3):
+    """Time and peak memory of the per-line loop vs the streaming generator."""
+    size_mb = os.path.getsize(file_path) / (1024 * 1024)
+
+    def per_line():
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return sum(len(c) for c in _per_line_chunk_loop(file.read(), chunk_size, overlap_size))
+
+    def streaming():
+        return sum(1 for _ in chunk_with_overlap(file_path, chunk_size, overlap_size))
+
+    results = {}
+    for name, run in (("per_line_loop", per_line), ("stream_generator", streaming)):
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            count = run()
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[name] = {
+            "chunks": count,
+            "seconds": round(best, 4),
+            "mb_per_sec": round(size_mb / best, 2),
+            "peak_memory_mb": round(peak / (1024 * 1024), 2)
+        }
+        print(f"{name:<18} {count:>9} chunks  {best:.3f}s  "
+              f"{results[name]['mb_per_sec']:>7.2f} MB/s  "
+              f"peak {results[name]['peak_memory_mb']:.2f} MB")
+    return results
+
+
+if __name__ == "__main__":
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./sample.txt"
+    print("Document Chunks:")
+    for chunk in chunk_with_overlap(file_path):
+        print(chunk)
+
+    print("\nBenchmark:")
+    benchmark_chunkers(file_path)
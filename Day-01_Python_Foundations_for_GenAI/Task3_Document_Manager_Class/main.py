@@ -1,11 +1,155 @@
+import os
+import re
 import json
+from bisect import bisect_left, bisect_right
+
+TOKEN_PATTERN = re.compile(r"\w+")
+QUERY_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+# Kept next to this script, whatever the working directory is
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "document_index.json")
+
+
+class InvertedIndex:
+    """
+    Positional inverted index over one document.
+
+    postings maps each lowercased token to the positions where it occurs;
+    token_offsets[position] is that token's character offset, and
+    line_starts turns an offset into a (line, column) pair with a bisect.
+    Supports single/multi-term, "quoted phrase" and prefix* queries; query
+    parts are tokenized like the document, so "hello-world" matches the
+    two adjacent tokens and "chunking," matches "chunking".
+    """
+
+    def __init__(self, postings, token_offsets, line_starts, source=None):
+        self.postings = postings
+        self.token_offsets = token_offsets
+        self.line_starts = line_starts
+        self.source = source or {}  # {"path", "size", "mtime"} of the indexed file
+        self.terms = sorted(postings)  # for prefix lookups
+
+    @staticmethod
+    def describe_source(file_path):
+        stat = os.stat(file_path)
+        return {
+            "path": os.path.abspath(file_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime
+        }
+
+    @classmethod
+    def build(cls, content, file_path=None):
+        postings = {}
+        token_offsets = []
+        for position, match in enumerate(TOKEN_PATTERN.finditer(content)):
+            postings.setdefault(match.group().lower(), []).append(position)
+            token_offsets.append(match.start())
+
+        line_starts = [0] + [m.end() for m in re.finditer("\n", content)]
+        source = cls.describe_source(file_path) if file_path and os.path.exists(file_path) else None
+        return cls(postings, token_offsets, line_starts, source)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "source": self.source,
+                "line_starts": self.line_starts,
+                "token_offsets": self.token_offsets,
+                "postings": self.postings
+            }, f)
+        print(f"✅ Index saved to '{path}'")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["postings"], data["token_offsets"],
+                   data["line_starts"], data.get("source"))
+
+    def matches_source(self, file_path):
+        """True if the index was built from this exact file (path, size and mtime)."""
+        return self.source == self.describe_source(file_path)
+
+    def _hit(self, position, text):
+        offset = self.token_offsets[position]
+        line = bisect_right(self.line_starts, offset) - 1
+        return {
+            "match": text,
+            "line": line + 1,
+            "column": offset - self.line_starts[line] + 1,
+            "offset": offset
+        }
+
+    def _prefix_terms(self, prefix):
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + "\U0010ffff")
+        return self.terms[start:end]
+
+    def _term_positions(self, term):
+        is_prefix = term.endswith("*")
+        tokens = [t.lower() for t in TOKEN_PATTERN.findall(term)]
+        if not tokens:
+            return []
+        if len(tokens) == 1 and is_prefix:
+            return sorted(
+                (pos, t) for t in self._prefix_terms(tokens[0])
+                for pos in self.postings[t]
+            )
+        # "chunking," → chunking; "hello-world" → the phrase hello world
+        return self._sequence_positions(tokens, term, last_is_prefix=is_prefix)
+
+    def _phrase_positions(self, phrase):
+        tokens = [t.lower() for t in TOKEN_PATTERN.findall(phrase)]
+        if not tokens:
+            return []
+        return self._sequence_positions(tokens, phrase)
+
+    def _sequence_positions(self, tokens, text, last_is_prefix=False):
+        """Start positions where tokens occur consecutively; a prefix needs 2+ tokens."""
+        following = [set(self.postings.get(t, ())) for t in tokens[1:]]
+        if last_is_prefix:
+            following[-1] = {
+                pos for t in self._prefix_terms(tokens[-1]) for pos in self.postings[t]
+            }
+        first = self.postings.get(tokens[0], [])
+        return [
+            (pos, text) for pos in first
+            if all(pos + i + 1 in positions for i, positions in enumerate(following))
+        ]
+
+    def search(self, query):
+        """
+        Every query part must match; returns the hits of each part.
+        Parts without any word characters (a stray "," or "") are ignored.
+        Example: 'python "text processing" chunk*'
+        """
+        results = {}
+        for phrase, term in QUERY_PATTERN.findall(query):
+            if not TOKEN_PATTERN.search(phrase or term):
+                continue
+            if phrase:
+                matches = self._phrase_positions(phrase)
+                key = f'"{phrase}"'
+            else:
+                key = term.lower()
+                matches = self._term_positions(key)
+            results[key] = [self._hit(pos, text) for pos, text in matches]
+
+        return {
+            "query": query,
+            "found": bool(results) and all(results.values()),
+            "hits": results
+        }
+
+
 class DocumentManager:
     def __init__ (self,file_path):
         self.file_path = file_path
         print(f"DocumentManager initialized with file: {self.file_path}")
         self.content = ""
+        self.index = None
 
-    def load_document(self):
+    def load_document(self, index_path=INDEX_PATH):
         print("Loading document...")
         print(f"File path: {self.file_path}")
         try:
@@ -13,17 +157,41 @@ class DocumentManager:
                 self.content = file.read()
                 print("Document Content:")
                 print(self.content)
+            self.load_index(index_path)
         except FileNotFoundError:
             print(f"The file at {self.file_path} does not exist.")
         except Exception as e:
             print(f"An error occurred: {e}")
 
+    def load_index(self, index_path=INDEX_PATH):
+        """Reuse the persisted index if it was built from this file as it is now, else rebuild it."""
+        if os.path.exists(index_path):
+            index = InvertedIndex.load(index_path)
+            if index.matches_source(self.file_path):
+                self.index = index
+                print(f"Index loaded from '{index_path}'")
+                return self.index
+            print(f"Index '{index_path}' was built from another file or version")
+
+        print("Building inverted index...")
+        self.index = InvertedIndex.build(self.content, self.file_path)
+        self.index.save(index_path)
+        return self.index
+
     def search_documents(self,keyword):
         print(f"Searching for keyword: {keyword}")
-        if keyword in self.content:
+        if self.index is None:
+            self.index = InvertedIndex.build(self.content, self.file_path)
+
+        result = self.index.search(keyword)
+        if result["found"]:
             print(f"Keyword '{keyword}' found in document.")
+            for part, hits in result["hits"].items():
+                locations = ", ".join(f"line {h['line']} col {h['column']}" for h in hits[:5])
+                print(f"  {part}: {len(hits)} hit(s) → {locations}")
         else:
             print(f"Keyword '{keyword}' not found in document.")
+        return result
 
 
     def calculate_document_statistics(self):
@@ -101,6 +269,7 @@ def export_to_json(data,output_file):
 doc = DocumentManager("sample.txt")
 doc.load_document()
 doc.search_documents("chunking")
+doc.search_documents('"sample text" chunk*')
 result = doc.calculate_document_statistics()
 print("\nReturned Statistics Dictionary:")
 print(result)
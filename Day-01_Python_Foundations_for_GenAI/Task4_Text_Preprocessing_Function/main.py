@@ -1,4 +1,122 @@
 import re
+import io
+import os
+import time
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+# ASCII characters that re.sub(r'[^\w\s]', '', text) would delete
+ASCII_PUNCTUATION = "".join(
+    c for c in map(chr, range(128)) if not re.match(r"[\w\s]", c)
+)
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+
+
+class PreprocessingPipeline:
+    """
+    Fused text preprocessing: every enabled step runs in a single
+    tokenizing pass instead of one full text copy per step.
+
+    Configure it declaratively, e.g.
+        PreprocessingPipeline.from_config({
+            "lowercase": True,
+            "remove_punctuation": True,
+            "collapse_whitespace": True,
+            "strip": True,
+            "stopwords": ["the", "is", "in"],
+        })
+    Output matches chaining the DocumentManager step methods in order.
+    """
+
+    def __init__(self, lowercase=True, remove_punctuation=True,
+                 collapse_whitespace=True, strip=True, stopwords=None):
+        self.lowercase = lowercase
+        self.remove_punctuation = remove_punctuation
+        self.collapse_whitespace = collapse_whitespace
+        self.strip = strip
+        self.stopwords = frozenset(w.lower() for w in stopwords or ())
+        self.punctuation_table = str.maketrans("", "", ASCII_PUNCTUATION)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(**config)
+
+    def _remove_punctuation(self, text):
+        # translate() is exact for ASCII; the regex covers Unicode punctuation
+        if text.isascii():
+            return text.translate(self.punctuation_table)
+        return PUNCTUATION_PATTERN.sub("", text)
+
+    def process(self, text):
+        if self.lowercase:
+            text = text.lower()
+        if self.remove_punctuation:
+            text = self._remove_punctuation(text)
+
+        if self.stopwords:
+            stop = self.stopwords
+            if self.lowercase:
+                words = [w for w in text.split() if w not in stop]
+            else:
+                words = [w for w in text.split() if w.lower() not in stop]
+            return " ".join(words)
+
+        if self.collapse_whitespace:
+            return " ".join(text.split())
+        if self.strip:
+            return text.strip()
+        return text
+
+    def process_many(self, texts, workers=1, chunksize=256):
+        """Process a list of documents in-process or across a process pool."""
+        if workers == 1:
+            return [self.process(text) for text in texts]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.process, texts, chunksize=chunksize))
+
+
+def benchmark_preprocessing(texts, stopwords, repeats=3, workers=None):
+    """Throughput (MB/s) of the step-by-step chain vs the fused pipeline."""
+    doc = DocumentManager("benchmark")
+    pipeline = PreprocessingPipeline(stopwords=stopwords)
+    size_mb = sum(len(t.encode("utf-8")) for t in texts) / (1024 * 1024)
+
+    def chain():
+        out = []
+        with redirect_stdout(io.StringIO()):
+            for text in texts:
+                doc.content = text
+                t = doc.convert_to_lowercase()
+                t = doc.remove_punctuation(t)
+                t = doc.remove_extra_whitespace(t)
+                t = doc.remove_leading_trailing_whitespace(t)
+                out.append(doc.remove_stopwords(t, stopwords))
+        return out
+
+    runs = {
+        "step_chain": chain,
+        "fused": lambda: pipeline.process_many(texts),
+        f"fused_parallel_{workers or os.cpu_count()}": lambda: pipeline.process_many(
+            texts, workers=workers
+        ),
+    }
+
+    results, reference = {}, None
+    for name, run in runs.items():
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            output = run()
+            best = min(best, time.perf_counter() - start)
+        if reference is None:
+            reference = output
+        elif output != reference:
+            raise AssertionError(f"{name} output differs from the step chain")
+        results[name] = round(size_mb / best, 2)
+        print(f"⏱️ {name:<22} {best:.3f}s  {results[name]:.2f} MB/s")
+    return results
+
+
 class DocumentManager:
     def __init__ (self,file_path):
         self.file_path = file_path
@@ -35,27 +153,47 @@ class DocumentManager:
         words = text.split()
         filtered_words = [word for word in words if word.lower() not in stopwords]
         return ' '.join(filtered_words)
-    
-doc = DocumentManager("sample.txt")
-doc.load_document()
-convert_to_lowercase = doc.convert_to_lowercase()
-print("----------------------------")
-print("Lowercase Text:")
-print(convert_to_lowercase)
-print("----------------------------")
-print("Punctuation Removed Text:")
-punctuation_removed = doc.remove_punctuation(convert_to_lowercase)
-print(punctuation_removed)
-print("----------------------------")
-print("Extra Whitespace Removed Text:")
-whitespace_removed = doc.remove_extra_whitespace(punctuation_removed)
-print(whitespace_removed)
-print("----------------------------")
-print("Leading and Trailing Whitespace Removed Text:")
-final_text = doc.remove_leading_trailing_whitespace(whitespace_removed)
-print(final_text)
-print("----------------------------")
-stopwords = {"the", "is", "in", "and", "to", "a"}
-stopwords_removed = doc.remove_stopwords(final_text, stopwords)
-print("Stopwords Removed Text:")
-print(stopwords_removed)
\ No newline at end of file
+
+    def preprocess(self, pipeline):
+        print("Running fused preprocessing pipeline...")
+        return pipeline.process(self.content)
+
+
+if __name__ == "__main__":
+    doc = DocumentManager("sample.txt")
+    doc.load_document()
+    convert_to_lowercase = doc.convert_to_lowercase()
+    print("----------------------------")
+    print("Lowercase Text:")
+    print(convert_to_lowercase)
+    print("----------------------------")
+    print("Punctuation Removed Text:")
+    punctuation_removed = doc.remove_punctuation(convert_to_lowercase)
+    print(punctuation_removed)
+    print("----------------------------")
+    print("Extra Whitespace Removed Text:")
+    whitespace_removed = doc.remove_extra_whitespace(punctuation_removed)
+    print(whitespace_removed)
+    print("----------------------------")
+    print("Leading and Trailing Whitespace Removed Text:")
+    final_text = doc.remove_leading_trailing_whitespace(whitespace_removed)
+    print(final_text)
+    print("----------------------------")
+    stopwords = {"the", "is", "in", "and", "to", "a"}
+    stopwords_removed = doc.remove_stopwords(final_text, stopwords)
+    print("Stopwords Removed Text:")
+    print(stopwords_removed)
+    print("----------------------------")
+    pipeline = PreprocessingPipeline.from_config({
+        "lowercase": True,
+        "remove_punctuation": True,
+        "collapse_whitespace": True,
+        "strip": True,
+        "stopwords": stopwords,
+    })
+    fused_text = doc.preprocess(pipeline)
+    print("Fused Pipeline Text:")
+    print(fused_text)
+    print("Matches step-by-step result:", fused_text == stopwords_removed)
+    print("----------------------------")
+    benchmark_preprocessing([doc.content] * 20000, stopwords)
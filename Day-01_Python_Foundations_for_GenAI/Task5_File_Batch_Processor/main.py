@@ -1,10 +1,98 @@
-import re,os,json
+import re,os,json,time
+import threading
+from multiprocessing import Pool
+
+BLOCK_SIZE = 1 << 20  # characters per read (~1 MiB of ASCII)
+
+# str.split() whitespace in ASCII → b" ", everything else → b"x" (a word starts at b" x")
+WORD_MASK = bytes(
+    0x20 if chr(b).isspace() else 0x78 for b in range(128)
+) + b"x" * 128
+
+
+def stream_document_statistics(file_path, block_size=BLOCK_SIZE):
+    """
+    Single-pass statistics over blocks of the decoded text (text mode, so
+    line endings are normalised); returns the same dict as
+    DocumentManager.calculate_document_statistics.
+    """
+    newlines = words = chars = 0
+    dots = exclamations = questions = 0
+    prev_space = True  # whether the previous block ended in whitespace
+
+    with open(file_path, "r", encoding="utf-8") as file:
+        for block in iter(lambda: file.read(block_size), ""):
+            newlines += block.count("\n")
+            chars += len(block)
+
+            dots += block.count(".")
+            exclamations += block.count("!")
+            questions += block.count("?")
+
+            # A word split across blocks is counted where it started
+            if block.isascii():
+                mask = ((b" " if prev_space else b"x") + block.encode("ascii")).translate(WORD_MASK)
+                words += mask.count(b" x")
+            else:
+                words += len(block.split())
+                if not prev_space and not block[0].isspace():
+                    words -= 1
+
+            prev_space = block[-1].isspace()
+
+    return {
+        "total_lines": newlines + 1,
+        "total_words": words,
+        "total_characters": chars - newlines,
+        "total_sentences_by_dot": dots,
+        "total_sentences_by_exclamation": exclamations,
+        "total_sentences_by_question": questions,
+        "total_sentences": dots + exclamations + questions
+    }
+
+
+def scan_files(directory, extensions=None):
+    """Recursively yield os.DirEntry objects for files, using os.scandir."""
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file() and (
+                        extensions is None or entry.name.endswith(extensions)
+                    ):
+                        yield entry
+        except OSError as e:
+            print(f"⚠️ Cannot scan {current}: {e}")
+
+
+def _statistics_output_path(relative_path, output_dir):
+    filename_only, _ = os.path.splitext(relative_path)
+    return os.path.join(output_dir, f"{filename_only}_statistics.json")
+
+
+def _process_file(job):
+    """Worker: compute statistics once and write the JSON output."""
+    input_path, relative_path, output_path = job
+    try:
+        stats = stream_document_statistics(input_path)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        tmp_path = output_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"file_name": relative_path, "statistics": stats}, f, indent=4)
+        os.replace(tmp_path, output_path)
+        return relative_path, None
+    except Exception as e:
+        return relative_path, str(e)
+
 class DocumentManager:
     def __init__ (self,file_path):
         print("Initializing Document Manager...")
         print(f"File path: {file_path}")
         self.file_path = file_path
-        self.files = os.listdir(file_path)
         
     def load_document(self):
         directory_path = self.file_path
@@ -34,7 +122,7 @@ class DocumentManager:
                     })
                     # calculate_document_statistics(self.content)
             except FileNotFoundError:
-                print(f"The file at {self.files} does not exist.")
+                print(f"The file at {full_path} does not exist.")
             except Exception as e:
                 print(f"An error occurred: {e}")
 
@@ -132,6 +220,56 @@ class DocumentManager:
         print("\n🎉 All document statistics exported successfully!")
     
     
+    def process_batch(self, output_dir, workers=None, extensions=None,
+                      chunksize=64, resume=True):
+        """
+        Batch mode for large trees: scan self.file_path recursively, fan the
+        files out to a process pool and write one statistics JSON per file
+        as soon as it is done. With resume=True, files whose output is newer
+        than the input are skipped.
+
+        Jobs stream from the scanner into imap_unordered, so work starts
+        while the tree is still being walked; at most a few chunks per
+        worker are queued ahead of the results.
+        """
+        start = time.perf_counter()
+        os.makedirs(output_dir, exist_ok=True)
+        print(f"✅ Output directory ready: '{output_dir}'")
+
+        summary = {"processed": 0, "skipped": 0, "failed": 0}
+        workers = workers or os.cpu_count() or 1
+        # The pool's feeder thread would otherwise drain the whole scan
+        in_flight = threading.Semaphore(workers * chunksize * 4)
+
+        def jobs():
+            for entry in scan_files(self.file_path, extensions):
+                relative_path = os.path.relpath(entry.path, self.file_path)
+                output_path = _statistics_output_path(relative_path, output_dir)
+                if resume:
+                    try:
+                        if os.stat(output_path).st_mtime >= entry.stat().st_mtime:
+                            summary["skipped"] += 1
+                            continue
+                    except FileNotFoundError:
+                        pass
+                in_flight.acquire()
+                yield entry.path, relative_path, output_path
+
+        with Pool(processes=workers) as pool:
+            for relative_path, error in pool.imap_unordered(_process_file, jobs(), chunksize=chunksize):
+                in_flight.release()
+                if error:
+                    summary["failed"] += 1
+                    print(f"❌ {relative_path}: {error}")
+                    continue
+                summary["processed"] += 1
+                if summary["processed"] % 1000 == 0:
+                    print(f"📄 Processed {summary['processed']} files...")
+
+        summary["seconds"] = round(time.perf_counter() - start, 2)
+        print(f"\n🎉 Batch complete: {summary}")
+        return summary
+
     def read_file_data(self):
         result = []
         for file_detail in self.file_details:
@@ -151,7 +289,6 @@ class DocumentManager:
 
 
 
-doc = DocumentManager("./data/")
-doc.load_document()
-doc.read_file_data()
-doc.export_to_json("./output")
\ No newline at end of file
+if __name__ == "__main__":
+    doc = DocumentManager("./data/")
+    doc.process_batch("./output")
@@ -1,13 +1,173 @@
 import os
-from pypdf import PdfReader
+import math
+import json
+import zlib
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pypdf import PdfReader, __version__ as PYPDF_VERSION
 from dotenv import load_dotenv
 
 load_dotenv()
+
+
+# ---- On-disk extraction cache ----
+
+class CachedPages:
+    """Read-only view of cached page texts; any page can be read on its own."""
+
+    def __init__(self, data_path, offsets):
+        self.data_path = data_path
+        self.offsets = offsets  # [start, end) byte range of each page's blob
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, page_index):
+        start, end = self.offsets[page_index]
+        with open(self.data_path, "rb") as f:
+            f.seek(start)
+            return zlib.decompress(f.read(end - start)).decode("utf-8")
+
+    def __iter__(self):
+        with open(self.data_path, "rb") as f:
+            for start, end in self.offsets:
+                f.seek(start)
+                yield zlib.decompress(f.read(end - start)).decode("utf-8")
+
+
+class PdfTextCache:
+    """
+    Extracted page text cached on disk, keyed by the PDF's content hash and
+    the pypdf version. A size+mtime index avoids re-hashing unchanged files.
+    Each page is zlib-compressed separately so pages are randomly addressable.
+    """
+
+    def __init__(self, cache_dir=".pdf_cache", extractor_version=PYPDF_VERSION):
+        self.cache_dir = cache_dir
+        self.extractor_version = extractor_version
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.index_path = os.path.join(cache_dir, "fingerprints.json")
+        self._fingerprints = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._fingerprints = json.load(f)
+
+    def _key(self, file_path):
+        stat = os.stat(file_path)
+        fast_key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        digest = self._fingerprints.get(fast_key)
+
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(block)
+            digest = sha.hexdigest()
+
+            self._fingerprints[fast_key] = digest
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump(self._fingerprints, f)
+
+        return f"{digest[:32]}-pypdf{self.extractor_version}"
+
+    def get(self, file_path):
+        key = self._key(file_path)
+        meta_path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return CachedPages(os.path.join(self.cache_dir, f"{key}.bin"), meta["offsets"])
+
+    def put(self, file_path, pages):
+        key = self._key(file_path)
+        data_path = os.path.join(self.cache_dir, f"{key}.bin")
+        offsets = []
+        pos = 0
+
+        with open(data_path + ".tmp", "wb") as f:
+            for text in pages:
+                blob = zlib.compress(text.encode("utf-8"), 6)
+                f.write(blob)
+                offsets.append([pos, pos + len(blob)])
+                pos += len(blob)
+        os.replace(data_path + ".tmp", data_path)
+
+        # Written last, so an interrupted put never looks like a cache hit
+        with open(os.path.join(self.cache_dir, f"{key}.json"), "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.basename(file_path), "offsets": offsets}, f)
+
+        return CachedPages(data_path, offsets)
+
+    def load(self, file_path, extract):
+        """Return cached pages, calling extract() and caching on a miss."""
+        cached = self.get(file_path)
+        if cached is not None:
+            print(f"⚡ Extraction cache hit: {len(cached)} pages")
+            return cached
+
+        print("Extraction cache miss → extracting pages")
+        return self.put(file_path, extract())
+
+
+# ---- Parallel page-sharded extraction ----
+
+def _extract_page_range(file_path, start, end):
+    """Worker: open a private PdfReader and extract pages [start, end)."""
+    reader = PdfReader(file_path)
+    return start, [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def extract_pages_parallel(file_path, total_pages, workers=None, shard_size=None):
+    """
+    Extract text from every page of a PDF, splitting the page range into
+    shards across a process pool. Each worker opens its own PdfReader and
+    results are merged back in page order.
+    """
+    workers = workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, math.ceil(total_pages / (workers * 4)))
+    shards = [
+        (start, min(start + shard_size, total_pages))
+        for start in range(0, total_pages, shard_size)
+    ]
+
+    pages = [""] * total_pages
+    done = 0
+    next_report = 10
+
+    def collect(start, texts):
+        nonlocal done, next_report
+        pages[start:start + len(texts)] = texts
+        done += len(texts)
+        percent = done * 100 // total_pages if total_pages else 100
+        if percent >= next_report or done == total_pages:
+            print(f"📄 Extracted {done}/{total_pages} pages ({percent}%)")
+            next_report = (percent // 10 + 1) * 10
+
+    if workers == 1 or len(shards) <= 1:
+        for start, end in shards:
+            collect(*_extract_page_range(file_path, start, end))
+        return pages
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+        futures = [
+            pool.submit(_extract_page_range, file_path, start, end)
+            for start, end in shards
+        ]
+        for future in as_completed(futures):
+            collect(*future.result())
+
+    return pages
+
+
 class DocPdfReader:
     def __init__ (self,file_path):
         self.file_path = file_path
         print(f"DocumentManager initialized with file: {self.file_path}")
         self.content = ""
+        self.cache = PdfTextCache()
 
     def add_context(self):
         print("Loading document...")
@@ -22,31 +182,17 @@ class DocPdfReader:
         start_page = 1
         end_page = total_pages
 
-        text_per_page = []
-        page_data = []
-
         print(f"Total pages detected: {total_pages}")
         print("Starting text extraction...\n")
 
-        for page_number in range(start_page - 1, end_page):
-            page = reader.pages[page_number]
-            page_text = page.extract_text() or ""
-
-            text_per_page.append(page_text)
-
-            page_details = {
-                "page_num": page_number + 1,
-                "content": page_text
-            }
-            page_data.append(page_details)
-
-            # 🔹 Progress indicator
-            progress = ((page_number + 1) / total_pages) * 100
-            print(
-                f"📄 Processing page {page_number + 1}/{total_pages} "
-                f"({progress:.2f}%)",
-                end="\r"
-            )
+        text_per_page = list(self.cache.load(
+            self.file_path,
+            lambda: extract_pages_parallel(self.file_path, total_pages)
+        ))
+        page_data = [
+            {"page_num": page_number + 1, "content": page_text}
+            for page_number, page_text in enumerate(text_per_page)
+        ]
 
         print("\n✅ PDF extraction completed.")
 
@@ -70,5 +216,6 @@ class DocPdfReader:
         print(result)
 
 
-readPdf = DocPdfReader("Sample.pdf")
-readPdf.add_context()
+if __name__ == "__main__":
+    readPdf = DocPdfReader("Sample.pdf")
+    readPdf.add_context()
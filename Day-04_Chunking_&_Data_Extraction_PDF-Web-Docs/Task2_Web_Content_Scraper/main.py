@@ -1,20 +1,81 @@
+import os
+import sys
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, urlencode, urlsplit, urlunsplit, parse_qsl
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+# Only <title>, <h1> and <table> subtrees are built; the rest of the page is skipped
+TABLE_STRAINER = SoupStrainer(["title", "h1", "table"])
+
+
+def build_session(pool_size=16, retries=3):
+    """Pooled keep-alive session with retry/backoff on transient errors."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def parse_tables(html):
+    """Parse only the title/h1/table nodes of a page with lxml."""
+    soup = BeautifulSoup(html, "lxml", parse_only=TABLE_STRAINER)
+
+    title = soup.find("h1") or soup.find("title")
+    tables = []
+    for table in soup.find_all("table"):
+        headers = [th.get_text(strip=True) for th in table.find_all("th")]
+        rows = []
+        for tr in table.find_all("tr"):
+            cells = tr.find_all("td")
+            if not cells:
+                continue  # header row
+            rows.append({
+                header: cell.get_text(strip=True)
+                for header, cell in zip(headers, cells)
+            })
+        tables.append({"headers": headers, "rows": rows})
+
+    return {
+        "website_title": title.get_text(strip=True) if title else "",
+        "tables": tables
+    }
+
 
 class Webscraper:
-    def __init__(self, url):
+    def __init__(self, url, session=None):
         self.url = url
+        self.session = session or build_session()
         print(f"URL for scrape: {self.url}")
 
     def scrape_table_data(self):
         try:
-            page = requests.get(self.url)
+            page = self.session.get(self.url, timeout=REQUEST_TIMEOUT)
             page.raise_for_status()  # ✅ HTTP error handling
         except requests.RequestException as e:
             print("Request failed:", e)
             return
 
-        soup = BeautifulSoup(page.content, "html.parser")
+        soup = BeautifulSoup(page.content, "lxml")
 
         webpage_data = soup.find(id="hockey")
         if not webpage_data:
@@ -51,7 +112,251 @@ class Webscraper:
         }
 
         print(result)
+        return result
+
+
+class ConditionalCache:
+    """
+    On-disk HTTP cache for conditional GETs. Stores each response body with
+    its ETag / Last-Modified; a 304 reply re-uses the stored body.
+
+    Entries are keyed by full URL, or by path + query with key_by_path=True
+    (for servers whose host/port changes between runs, like the fixture).
+    Body and metadata are each written to a temp file and os.replace'd, body
+    first, so a crash never leaves metadata pointing at a partial body.
+    """
+
+    def __init__(self, cache_dir=".http_cache", key_by_path=False):
+        self.cache_dir = cache_dir
+        self.key_by_path = key_by_path
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        if self.key_by_path:
+            parts = urlsplit(url)
+            url = urlunsplit(("", "", parts.path, parts.query, ""))
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".body"
+
+    def validators(self, url):
+        meta_path, body_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return {}
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url):
+        """Cached body, or None if it is missing."""
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def store(self, url, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        meta_path, body_path = self._paths(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified}
+        self._write_atomic(body_path, response.content)
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+class TableCrawler:
+    """
+    Crawler mode for paginated table sources.
+
+    Pages are fetched on a thread pool over one pooled session, with at most
+    `per_host_limit` requests in flight per host. Conditional GETs skip
+    downloading unchanged pages, and each page is parsed with lxml through
+    TABLE_STRAINER. crawl() yields page results as they complete.
+    """
+
+    def __init__(self, max_workers=8, per_host_limit=4, cache_dir=".http_cache",
+                 session=None, cache_key_by_path=False):
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.session = session or build_session(pool_size=max_workers)
+        self.cache = (ConditionalCache(cache_dir, key_by_path=cache_key_by_path)
+                      if cache_dir else None)
+        self._host_limits = {}
+        self._lock = threading.Lock()
+        self.stats = {"fetched": 0, "not_modified": 0, "failed": 0}
+
+    def _host_limit(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.Semaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+    def fetch(self, url):
+        headers = self.cache.validators(url) if self.cache else {}
+        with self._host_limit(url):
+            response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code == 304 and self.cache:
+            body = self.cache.load(url)
+            if body is not None:
+                with self._lock:
+                    self.stats["not_modified"] += 1
+                return body, True
+            # Cached body vanished since validators() ran: fetch it unconditionally
+            with self._host_limit(url):
+                response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+
+        response.raise_for_status()
+        if self.cache:
+            self.cache.store(url, response)
+        with self._lock:
+            self.stats["fetched"] += 1
+        return response.content, False
+
+    def _crawl_one(self, url):
+        body, cached = self.fetch(url)
+        page = parse_tables(body)
+        page["url"] = url
+        page["from_cache"] = cached
+        return page
+
+    def crawl(self, urls):
+        """Yield parsed pages as soon as each one is ready (completion order)."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._crawl_one, url): url for url in urls}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except requests.RequestException as e:
+                    with self._lock:
+                        self.stats["failed"] += 1
+                    print(f"Request failed: {futures[future]} → {e}")
+
+
+def paginate(base_url, pages, param="page_num", start=1):
+    """Build the page URLs of a ?page_num=N style paginated listing."""
+    scheme, netloc, path, query, fragment = urlsplit(base_url)
+    params = dict(parse_qsl(query))
+    for page in range(start, start + pages):
+        params[param] = str(page)
+        yield urlunsplit((scheme, netloc, path, urlencode(params), fragment))
+
+
+def rows_to_chunks(pages, rows_per_chunk=25):
+    """
+    Stream crawled table rows into chunk dicts (the shape the chunking
+    pipeline emits) so pages can be embedded as they arrive.
+    """
+    chunk_id = 1
+    for page in pages:
+        for table_index, table in enumerate(page["tables"]):
+            rows = table["rows"]
+            for start in range(0, len(rows), rows_per_chunk):
+                batch = rows[start:start + rows_per_chunk]
+                text = "\n".join(
+                    " | ".join(f"{k}: {v}" for k, v in row.items()) for row in batch
+                )
+                yield {
+                    "chunk_id": chunk_id,
+                    "source": page["url"],
+                    "title": page["website_title"],
+                    "table_index": table_index,
+                    "row_start": start,
+                    "row_end": start + len(batch),
+                    "word_count": len(text.split()),
+                    "text": text
+                }
+                chunk_id += 1
+
+
+# ---- Local fixture server ----
+
+def serve_fixture_pages(pages, host="127.0.0.1", port=0):
+    """
+    Serve {path: html} from a background ThreadingHTTPServer with ETag and
+    Last-Modified support, for exercising the crawler without the network.
+    Returns (server, base_url); call server.shutdown() when done.
+    """
+    last_modified = formatdate(usegmt=True)
+    bodies = {
+        path: (html.encode("utf-8"), '"%s"' % hashlib.md5(html.encode("utf-8")).hexdigest())
+        for path, html in pages.items()
+    }
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("#")[0]
+            if path not in bodies:
+                self.send_error(404)
+                return
+
+            body, etag = bodies[path]
+            if (self.headers.get("If-None-Match") == etag
+                    or self.headers.get("If-Modified-Since") == last_modified):
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def fixture_table_pages(pages=5, rows=40):
+    html = {}
+    for page in range(1, pages + 1):
+        body_rows = "".join(
+            f"<tr><td>Team {page}-{r}</td><td>{2000 + r % 20}</td><td>{r * 3 % 50}</td></tr>"
+            for r in range(rows)
+        )
+        html[f"/teams?page_num={page}"] = (
+            "<html><head><title>Teams</title></head><body>"
+            f"<div><h1>Hockey Teams page {page}</h1><p>Filler text.</p></div>"
+            "<table class='table'><tr><th>Team Name</th><th>Year</th><th>Wins</th></tr>"
+            f"{body_rows}</table></body></html>"
+        )
+    return html
 
 
-read_website_data = Webscraper("https://www.scrapethissite.com/pages/forms/")
-read_website_data.scrape_table_data()
+if __name__ == "__main__":
+    if "--fixture" in sys.argv:
+        server, base_url = serve_fixture_pages(fixture_table_pages())
+        urls = list(paginate(f"{base_url}/teams", pages=5))
+        # The fixture port changes every run, so cache entries are keyed by path
+        crawler = TableCrawler(cache_dir=".http_cache", cache_key_by_path=True)
+        for _ in range(2):  # the second pass is answered with 304s
+            chunks = list(rows_to_chunks(crawler.crawl(urls)))
+            print(f"Chunks: {len(chunks)} | {crawler.stats}")
+        server.shutdown()
+    else:
+        read_website_data = Webscraper("https://www.scrapethissite.com/pages/forms/")
+        read_website_data.scrape_table_data()
@@ -0,0 +1,49 @@
+import os
+import glob
+import tempfile
+import unittest
+
+from main import TableCrawler, serve_fixture_pages, fixture_table_pages, paginate
+
+
+class ConditionalCrawlTest(unittest.TestCase):
+    def setUp(self):
+        self.server, base_url = serve_fixture_pages(fixture_table_pages(pages=1, rows=3))
+        self.url = next(paginate(f"{base_url}/teams", pages=1))
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.crawler = TableCrawler(max_workers=2, cache_dir=self.cache_dir.name,
+                                    cache_key_by_path=True)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.cache_dir.cleanup()
+
+    def crawl(self):
+        pages = list(self.crawler.crawl([self.url]))
+        self.assertEqual(len(pages), 1)
+        return pages[0]
+
+    def test_200_then_304_revalidation(self):
+        first = self.crawl()
+        self.assertFalse(first["from_cache"])
+        self.assertEqual(len(first["tables"][0]["rows"]), 3)
+
+        second = self.crawl()
+        self.assertTrue(second["from_cache"])
+        self.assertEqual(second["tables"], first["tables"])
+        self.assertEqual(self.crawler.stats, {"fetched": 1, "not_modified": 1, "failed": 0})
+
+    def test_missing_body_refetches(self):
+        self.crawl()
+        for body in glob.glob(os.path.join(self.cache_dir.name, "*.body")):
+            os.remove(body)
+
+        page = self.crawl()
+        self.assertFalse(page["from_cache"])
+        self.assertEqual(len(page["tables"][0]["rows"]), 3)
+        self.assertEqual(self.crawler.stats["fetched"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
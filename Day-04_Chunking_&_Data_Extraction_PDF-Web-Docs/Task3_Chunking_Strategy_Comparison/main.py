@@ -1,63 +1,215 @@
-from pypdf import PdfReader
+import os
+import math
+import json
+import zlib
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pypdf import PdfReader, __version__ as PYPDF_VERSION
 from dotenv import load_dotenv
 import re
+import time
+import statistics
 
 load_dotenv()
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+
+# ---- On-disk extraction cache ----
+
+class CachedPages:
+    """Read-only view of cached page texts; any page can be read on its own."""
+
+    def __init__(self, data_path, offsets):
+        self.data_path = data_path
+        self.offsets = offsets  # [start, end) byte range of each page's blob
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, page_index):
+        start, end = self.offsets[page_index]
+        with open(self.data_path, "rb") as f:
+            f.seek(start)
+            return zlib.decompress(f.read(end - start)).decode("utf-8")
+
+    def __iter__(self):
+        with open(self.data_path, "rb") as f:
+            for start, end in self.offsets:
+                f.seek(start)
+                yield zlib.decompress(f.read(end - start)).decode("utf-8")
+
+
+class PdfTextCache:
+    """
+    Extracted page text cached on disk, keyed by the PDF's content hash and
+    the pypdf version. A size+mtime index avoids re-hashing unchanged files.
+    Each page is zlib-compressed separately so pages are randomly addressable.
+    """
+
+    def __init__(self, cache_dir=".pdf_cache", extractor_version=PYPDF_VERSION):
+        self.cache_dir = cache_dir
+        self.extractor_version = extractor_version
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.index_path = os.path.join(cache_dir, "fingerprints.json")
+        self._fingerprints = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._fingerprints = json.load(f)
+
+    def _key(self, file_path):
+        stat = os.stat(file_path)
+        fast_key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        digest = self._fingerprints.get(fast_key)
+
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(block)
+            digest = sha.hexdigest()
+
+            self._fingerprints[fast_key] = digest
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump(self._fingerprints, f)
+
+        return f"{digest[:32]}-pypdf{self.extractor_version}"
+
+    def get(self, file_path):
+        key = self._key(file_path)
+        meta_path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return CachedPages(os.path.join(self.cache_dir, f"{key}.bin"), meta["offsets"])
+
+    def put(self, file_path, pages):
+        key = self._key(file_path)
+        data_path = os.path.join(self.cache_dir, f"{key}.bin")
+        offsets = []
+        pos = 0
+
+        with open(data_path + ".tmp", "wb") as f:
+            for text in pages:
+                blob = zlib.compress(text.encode("utf-8"), 6)
+                f.write(blob)
+                offsets.append([pos, pos + len(blob)])
+                pos += len(blob)
+        os.replace(data_path + ".tmp", data_path)
+
+        # Written last, so an interrupted put never looks like a cache hit
+        with open(os.path.join(self.cache_dir, f"{key}.json"), "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.basename(file_path), "offsets": offsets}, f)
+
+        return CachedPages(data_path, offsets)
+
+    def load(self, file_path, extract):
+        """Return cached pages, calling extract() and caching on a miss."""
+        cached = self.get(file_path)
+        if cached is not None:
+            print(f"⚡ Extraction cache hit: {len(cached)} pages")
+            return cached
+
+        print("Extraction cache miss → extracting pages")
+        return self.put(file_path, extract())
+
+
+# ---- Parallel page-sharded extraction ----
+
+def _extract_page_range(file_path, start, end):
+    """Worker: open a private PdfReader and extract pages [start, end)."""
+    reader = PdfReader(file_path)
+    return start, [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def extract_pages_parallel(file_path, total_pages, workers=None, shard_size=None):
+    """
+    Extract text from every page of a PDF, splitting the page range into
+    shards across a process pool. Each worker opens its own PdfReader and
+    results are merged back in page order.
+    """
+    workers = workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, math.ceil(total_pages / (workers * 4)))
+    shards = [
+        (start, min(start + shard_size, total_pages))
+        for start in range(0, total_pages, shard_size)
+    ]
+
+    pages = [""] * total_pages
+    done = 0
+    next_report = 10
+
+    def collect(start, texts):
+        nonlocal done, next_report
+        pages[start:start + len(texts)] = texts
+        done += len(texts)
+        percent = done * 100 // total_pages if total_pages else 100
+        if percent >= next_report or done == total_pages:
+            print(f"📄 Extracted {done}/{total_pages} pages ({percent}%)")
+            next_report = (percent // 10 + 1) * 10
+
+    if workers == 1 or len(shards) <= 1:
+        for start, end in shards:
+            collect(*_extract_page_range(file_path, start, end))
+        return pages
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+        futures = [
+            pool.submit(_extract_page_range, file_path, start, end)
+            for start, end in shards
+        ]
+        for future in as_completed(futures):
+            collect(*future.result())
+
+    return pages
+
+
+def extract_pdf_pages(file_path):
+    """Open the PDF, check it is readable and extract all pages in parallel."""
+    reader = PdfReader(file_path)
+
+    if reader.is_encrypted:
+        raise Exception("PDF is password-protected and cannot be read.")
+
+    total_pages = len(reader.pages)
+    print(f"Total pages detected: {total_pages}")
+    print("Starting text extraction...\n")
+    return extract_pages_parallel(file_path, total_pages)
+
+
 class ChunkingStrategyComparison:
     def __init__ (self,file_path):
         self.file_path = file_path
         print(f"DocumentManager initialized with file: {self.file_path}")
         self.content = ""
+        self.cache = PdfTextCache()
 
     def add_context(self):
         print("Loading document...")
         print(f"File path: {self.file_path}")
 
-        reader = PdfReader(self.file_path)
-
-        if reader.is_encrypted:
-            raise Exception("PDF is password-protected and cannot be read.")
-
-        total_pages = len(reader.pages)
-        start_page = 1
-        end_page = total_pages
-
-        text_per_page = []
-        page_data = []
-
-
-        print(f"Total pages detected: {total_pages}")
-        print("Starting text extraction...\n")
-
-        for page_number in range(start_page - 1, end_page):
-            page = reader.pages[page_number]
-            page_text = page.extract_text() or ""
-            text_per_page.append(page_text)
-            page_details = {
-                "page_num": page_number + 1,
-                "content": page_text
-            }
-            page_data.append(page_details)
-            # 🔹 Progress indicator
-            progress = ((page_number + 1) / total_pages) * 100
-            print(
-                f"📄 Processing page {page_number + 1}/{total_pages} "
-                f"({progress:.2f}%)",
-                end="\r"
-            )
+        text_per_page = list(self.cache.load(
+            self.file_path, lambda: extract_pdf_pages(self.file_path)
+        ))
         self.text_data = text_per_page
 
         print("\n✅ PDF extraction completed.")
-    def chunking_by_word(self):
+    def chunking_by_word(self, chunk_size=10, overlap_size=3, verbose=True):
+        # The window must advance, otherwise the loop below never ends
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= overlap_size < chunk_size:
+            raise ValueError("overlap_size must be >= 0 and smaller than chunk_size")
+
         # Tokenize by words
         content = " ".join(self.text_data).split()
         # print(content)
 
         word_length = len(content)
 
-        chunk_size = 10
-        overlap_size = 3
-
         start = 0
         chunk_id = 0
         chunk_text = []
@@ -76,69 +228,80 @@ class ChunkingStrategyComparison:
 
             chunk_id += 1
             start += (chunk_size - overlap_size)
-        print(chunk_words)
+        if verbose and chunk_text:
+            print(chunk_words)
         return chunk_text
     
-    def chunking_by_sentence(self):
-        # Join text data
-        content = " ".join(self.text_data)
-        # print('=======>>>>>',self.text_data)
-        content = content.replace("\n", " ").strip()
-
-        # Split into sentences
-        sentences = re.split(r'(?<=[.!?])\s+', content)
-
-        max_words = 100           # similar to chunk_size
-        overlap_sentences = 1     # sentence-level overlap
-
-        chunks = []
-        current_chunk = []
-        current_word_count = 0
-
+    def chunking_by_sentence(self, max_words=100, overlap_sentences=1):
+        return list(self.iter_sentence_chunks(
+            max_words=max_words, overlap_sentences=overlap_sentences
+        ))
+
+    def iter_sentence_chunks(self, pages=None, max_words=100, overlap_sentences=1):
+        """
+        Sentence-aware chunker that yields chunks as pages arrive.
+
+        Every sentence is split and counted exactly once. The open chunk
+        keeps a prefix sum of its sentence word counts, so closing a chunk
+        and carrying `overlap_sentences` into the next one never re-splits
+        text: the whole pass is O(n) in the number of words.
+
+        `pages` can be any iterable of page texts (e.g. a lazy CachedPages
+        view or a generator); defaults to the loaded `text_data`. The tail
+        of each page is held back until the next page arrives because a
+        sentence may continue across the page break.
+        """
+        if pages is None:
+            pages = self.text_data
+
+        window = []        # sentences of the open chunk
+        prefix = [0]       # prefix[i] = words in window[:i]
+        carried = 0        # leading sentences of window repeated as overlap
+        start_pos = 0      # global word offset of window[0]
         chunk_id = 0
-        start_word_pos = 0
-
-        for sentence in sentences:
-            sentence_words = sentence.split()
-            sentence_word_count = len(sentence_words)
 
-            # If adding sentence exceeds limit → close chunk
-            if current_word_count + sentence_word_count > max_words:
-                chunk_text = " ".join(current_chunk)
+        def close():
+            return {
+                "chunk_id": chunk_id,
+                "text": " ".join(window),
+                "start_pos": start_pos,
+                "end_pos": start_pos + prefix[-1],
+                "word_count": prefix[-1]
+            }
 
-                chunks.append({
-                    "chunk_id": chunk_id,
-                    "text": chunk_text,
-                    "start_pos": start_word_pos,
-                    "end_pos": start_word_pos + current_word_count,
-                    "word_count": current_word_count
-                })
+        def sentences():
+            tail = ""
+            for page in pages:
+                text = f"{tail} {page}" if tail else page
+                parts = SENTENCE_BOUNDARY.split(text.replace("\n", " ").strip())
+                tail = parts.pop()
+                yield from parts
+            if tail:
+                yield tail
+
+        for sentence in sentences():
+            count = len(sentence.split())
+
+            if prefix[-1] + count > max_words and window:
+                # Don't emit a chunk that only repeats the previous overlap
+                if len(window) > carried:
+                    yield close()
+                    chunk_id += 1
 
-                chunk_id += 1
+                keep = min(overlap_sentences, len(window))
+                drop = len(window) - keep
+                start_pos += prefix[drop]
+                window = window[drop:]
+                prefix = [words - prefix[drop] for words in prefix[drop:]]
+                carried = keep
 
-                # Sentence-level overlap
-                current_chunk = current_chunk[-overlap_sentences:] if overlap_sentences else []
-                current_word_count = sum(len(s.split()) for s in current_chunk)
-                start_word_pos += current_word_count
+            window.append(sentence)
+            prefix.append(prefix[-1] + count)
 
-            # Add sentence
-            current_chunk.append(sentence)
-            current_word_count += sentence_word_count
+        if len(window) > carried:
+            yield close()
 
-        # Add last chunk
-        if current_chunk:
-            chunk_text = " ".join(current_chunk)
-            chunks.append({
-                "chunk_id": chunk_id,
-                "text": chunk_text,
-                "start_pos": start_word_pos,
-                "end_pos": start_word_pos + current_word_count,
-                "word_count": current_word_count
-            })
-        # print(chunks)
-        return chunks
-    
-    def chunking_by_paragraph(self):
+    def chunking_by_paragraph(self, verbose=True):
             """
             Splits text into paragraphs with strong boundary rules.
             Returns a list of dictionaries with 'chunk_id', 'text', 'start_pos', 'end_pos', 'word_count'.
@@ -191,14 +354,172 @@ class ChunkingStrategyComparison:
                     "end_pos": end_pos,
                     "word_count": len(words)
                 })
-            print(paragraphs)
+            if verbose:
+                print(paragraphs)
 
             return paragraphs
 
         
 
-readPdf = ChunkingStrategyComparison("Sample.pdf")
-readPdf.add_context()
-readPdf.chunking_by_word()
-# readPdf.chunking_by_sentence()
-# readPdf.chunking_by_paragraph()
\ No newline at end of file
+# ---- Chunking benchmark harness ----
+
+DEFAULT_GRID = {
+    "word": [
+        {"chunk_size": size, "overlap_size": size // 5}
+        for size in (50, 100, 200, 400)
+    ],
+    "sentence": [
+        {"max_words": words, "overlap_sentences": overlap}
+        for words in (50, 100, 200) for overlap in (0, 1)
+    ],
+    "paragraph": [{}],
+}
+
+STRATEGY_METHODS = {
+    "word": lambda doc, **params: doc.chunking_by_word(verbose=False, **params),
+    "sentence": lambda doc, **params: doc.chunking_by_sentence(**params),
+    "paragraph": lambda doc, **params: doc.chunking_by_paragraph(verbose=False, **params),
+}
+
+
+class ChunkingBenchmark:
+    """
+    Runs every chunking strategy over a parameter grid and measures:
+    chunking throughput (MB/s), chunk-size distribution, embedding cost
+    (tokens, estimated API price and local encode time), index memory
+    and retrieval recall@k on a labelled question set.
+
+    A question counts as answered when any of the top-k retrieved chunks
+    contains its answer string (case- and whitespace-insensitive).
+    """
+
+    def __init__(self, document, questions_file="questions.json",
+                 model_name="all-MiniLM-L6-v2", k=3, repeats=3,
+                 price_per_million_tokens=0.02):
+        from sentence_transformers import SentenceTransformer
+        import tiktoken
+
+        self.document = document
+        self.k = k
+        self.repeats = repeats
+        self.price_per_million_tokens = price_per_million_tokens
+
+        with open(questions_file, "r", encoding="utf-8") as f:
+            self.questions = json.load(f)
+
+        self.model = SentenceTransformer(model_name)
+        self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        self.question_embeddings = self.model.encode(
+            [q["question"] for q in self.questions],
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        self.text_bytes = len(" ".join(document.text_data).encode("utf-8"))
+
+    @staticmethod
+    def _normalize(text):
+        return " ".join(text.lower().split())
+
+    def _size_distribution(self, chunks):
+        sizes = sorted(c["word_count"] for c in chunks)
+        if not sizes:
+            return {}
+        return {
+            "min": sizes[0],
+            "max": sizes[-1],
+            "mean": round(statistics.mean(sizes), 2),
+            "stdev": round(statistics.pstdev(sizes), 2),
+            "p50": sizes[len(sizes) // 2],
+            "p90": sizes[min(len(sizes) - 1, int(len(sizes) * 0.9))],
+        }
+
+    def _recall_at_k(self, chunks, chunk_embeddings):
+        scores = self.question_embeddings @ chunk_embeddings.T
+        k = min(self.k, len(chunks))
+        texts = [self._normalize(c["text"]) for c in chunks]
+
+        hits = 0
+        for q, row in zip(self.questions, scores):
+            answer = self._normalize(q["answer"])
+            top = row.argsort()[::-1][:k]
+            hits += any(answer in texts[i] for i in top)
+        return hits / len(self.questions) if self.questions else 0.0
+
+    def evaluate(self, strategy, params):
+        chunk_fn = STRATEGY_METHODS[strategy]
+
+        timings = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            chunks = chunk_fn(self.document, **params)
+            timings.append(time.perf_counter() - start)
+        chunk_seconds = min(timings)
+
+        texts = [c["text"] for c in chunks]
+        tokens = sum(len(t) for t in self.tokenizer.encode_batch(texts))
+
+        start = time.perf_counter()
+        embeddings = self.model.encode(
+            texts, convert_to_numpy=True, normalize_embeddings=True
+        )
+        embed_seconds = time.perf_counter() - start
+
+        text_bytes = sum(len(t.encode("utf-8")) for t in texts)
+
+        result = {
+            "strategy": strategy,
+            "params": params,
+            "num_chunks": len(chunks),
+            "throughput_mb_s": round(
+                self.text_bytes / 1e6 / chunk_seconds, 2
+            ) if chunk_seconds else None,
+            "chunk_words": self._size_distribution(chunks),
+            "embedding_tokens": tokens,
+            "embedding_cost_usd": round(
+                tokens / 1e6 * self.price_per_million_tokens, 6
+            ),
+            "embedding_seconds": round(embed_seconds, 3),
+            "index_memory_bytes": int(embeddings.nbytes) + text_bytes,
+            f"recall_at_{self.k}": round(
+                self._recall_at_k(chunks, embeddings), 4
+            ),
+        }
+        print(
+            f"📊 {strategy:<9} {json.dumps(params):<45} "
+            f"chunks={result['num_chunks']:<5} "
+            f"recall@{self.k}={result[f'recall_at_{self.k}']:.2f} "
+            f"tokens={tokens}"
+        )
+        return result
+
+    def run(self, grid=None):
+        grid = grid or DEFAULT_GRID
+        results = []
+        for strategy, param_sets in grid.items():
+            for params in param_sets:
+                results.append(self.evaluate(strategy, params))
+        return results
+
+    def export(self, results, output_file="chunking_benchmark.json"):
+        report = {
+            "document": self.document.file_path,
+            "document_bytes": self.text_bytes,
+            "questions": len(self.questions),
+            "k": self.k,
+            "results": results,
+        }
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+        print(f"✅ Benchmark report written to {output_file}")
+        return report
+
+
+if __name__ == "__main__":
+    readPdf = ChunkingStrategyComparison("Sample.pdf")
+    readPdf.add_context()
+    readPdf.chunking_by_word()
+    # readPdf.chunking_by_sentence()
+    # readPdf.chunking_by_paragraph()
+
+    # benchmark = ChunkingBenchmark(readPdf)
+    # benchmark.export(benchmark.run())
\ No newline at end of file
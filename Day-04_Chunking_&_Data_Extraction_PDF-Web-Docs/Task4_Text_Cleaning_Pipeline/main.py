@@ -1,82 +1,390 @@
-from pypdf import PdfReader
+import os
+import math
+import json
+import zlib
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pypdf import PdfReader, __version__ as PYPDF_VERSION
 from dotenv import load_dotenv
 import re
+import time
 
 load_dotenv()
+
+
+# ---- On-disk extraction cache ----
+
+class CachedPages:
+    """Read-only view of cached page texts; any page can be read on its own."""
+
+    def __init__(self, data_path, offsets):
+        self.data_path = data_path
+        self.offsets = offsets  # [start, end) byte range of each page's blob
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, page_index):
+        start, end = self.offsets[page_index]
+        with open(self.data_path, "rb") as f:
+            f.seek(start)
+            return zlib.decompress(f.read(end - start)).decode("utf-8")
+
+    def __iter__(self):
+        with open(self.data_path, "rb") as f:
+            for start, end in self.offsets:
+                f.seek(start)
+                yield zlib.decompress(f.read(end - start)).decode("utf-8")
+
+
+class PdfTextCache:
+    """
+    Extracted page text cached on disk, keyed by the PDF's content hash and
+    the pypdf version. A size+mtime index avoids re-hashing unchanged files.
+    Each page is zlib-compressed separately so pages are randomly addressable.
+    """
+
+    def __init__(self, cache_dir=".pdf_cache", extractor_version=PYPDF_VERSION):
+        self.cache_dir = cache_dir
+        self.extractor_version = extractor_version
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.index_path = os.path.join(cache_dir, "fingerprints.json")
+        self._fingerprints = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._fingerprints = json.load(f)
+
+    def _key(self, file_path):
+        stat = os.stat(file_path)
+        fast_key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        digest = self._fingerprints.get(fast_key)
+
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(block)
+            digest = sha.hexdigest()
+
+            self._fingerprints[fast_key] = digest
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump(self._fingerprints, f)
+
+        return f"{digest[:32]}-pypdf{self.extractor_version}"
+
+    def get(self, file_path):
+        key = self._key(file_path)
+        meta_path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return CachedPages(os.path.join(self.cache_dir, f"{key}.bin"), meta["offsets"])
+
+    def put(self, file_path, pages):
+        key = self._key(file_path)
+        data_path = os.path.join(self.cache_dir, f"{key}.bin")
+        offsets = []
+        pos = 0
+
+        with open(data_path + ".tmp", "wb") as f:
+            for text in pages:
+                blob = zlib.compress(text.encode("utf-8"), 6)
+                f.write(blob)
+                offsets.append([pos, pos + len(blob)])
+                pos += len(blob)
+        os.replace(data_path + ".tmp", data_path)
+
+        # Written last, so an interrupted put never looks like a cache hit
+        with open(os.path.join(self.cache_dir, f"{key}.json"), "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.basename(file_path), "offsets": offsets}, f)
+
+        return CachedPages(data_path, offsets)
+
+    def load(self, file_path, extract):
+        """Return cached pages, calling extract() and caching on a miss."""
+        cached = self.get(file_path)
+        if cached is not None:
+            print(f"⚡ Extraction cache hit: {len(cached)} pages")
+            return cached
+
+        print("Extraction cache miss → extracting pages")
+        return self.put(file_path, extract())
+
+
+# ---- Parallel page-sharded extraction ----
+
+def _extract_page_range(file_path, start, end):
+    """Worker: open a private PdfReader and extract pages [start, end)."""
+    reader = PdfReader(file_path)
+    return start, [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def extract_pages_parallel(file_path, total_pages, workers=None, shard_size=None):
+    """
+    Extract text from every page of a PDF, splitting the page range into
+    shards across a process pool. Each worker opens its own PdfReader and
+    results are merged back in page order.
+    """
+    workers = workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, math.ceil(total_pages / (workers * 4)))
+    shards = [
+        (start, min(start + shard_size, total_pages))
+        for start in range(0, total_pages, shard_size)
+    ]
+
+    pages = [""] * total_pages
+    done = 0
+    next_report = 10
+
+    def collect(start, texts):
+        nonlocal done, next_report
+        pages[start:start + len(texts)] = texts
+        done += len(texts)
+        percent = done * 100 // total_pages if total_pages else 100
+        if percent >= next_report or done == total_pages:
+            print(f"📄 Extracted {done}/{total_pages} pages ({percent}%)")
+            next_report = (percent // 10 + 1) * 10
+
+    if workers == 1 or len(shards) <= 1:
+        for start, end in shards:
+            collect(*_extract_page_range(file_path, start, end))
+        return pages
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+        futures = [
+            pool.submit(_extract_page_range, file_path, start, end)
+            for start, end in shards
+        ]
+        for future in as_completed(futures):
+            collect(*future.result())
+
+    return pages
+
+
+def extract_pdf_pages(file_path):
+    """Open the PDF, check it is readable and extract all pages in parallel."""
+    reader = PdfReader(file_path)
+
+    if reader.is_encrypted:
+        raise Exception("PDF is password-protected and cannot be read.")
+
+    total_pages = len(reader.pages)
+    print(f"Total pages detected: {total_pages}")
+    print("Starting text extraction...\n")
+    return extract_pages_parallel(file_path, total_pages)
+
+
+class _TranslateTable(dict):
+    """
+    str.translate mapping built lazily: the first time a character is seen,
+    every merged character-level rule is applied to it in order and the
+    result is cached, so all of them run in a single translate pass.
+    """
+
+    def __init__(self, char_rules):
+        super().__init__()
+        self.char_rules = char_rules
+
+    def __missing__(self, code):
+        text = chr(code)
+        for rule in self.char_rules:
+            text = rule(text)
+        value = text if text else None  # None deletes the character
+        self[code] = value
+        return value
+
+
+class CleaningPipeline:
+    """
+    Composable text cleaning rules, compiled into as few passes as possible.
+
+    - Adjacent character-level rules (single-char replacements, allow-lists)
+      are merged into one str.translate table.
+    - Multi-character replacements are merged into one compiled regex.
+    - Timings are collected per compiled stage.
+    """
+
+    def __init__(self):
+        self.rules = []
+        self.timings = {}
+        self._stages = None
+
+    # ---- Rule builders ----
+    def replace(self, name, mapping):
+        self.rules.append((name, "replace", dict(mapping)))
+        self._stages = None
+        return self
+
+    def keep_only(self, name, char_class):
+        """Delete every character not matched by the regex character class."""
+        self.rules.append((name, "keep_only", re.compile(f"[^{char_class}]")))
+        self._stages = None
+        return self
+
+    def regex(self, name, pattern, repl):
+        self.rules.append((name, "regex", (re.compile(pattern), repl)))
+        self._stages = None
+        return self
+
+    def collapse_whitespace(self, name="collapse_whitespace"):
+        self.rules.append((name, "collapse", None))
+        self._stages = None
+        return self
+
+    # ---- Compilation ----
+    def _compile(self):
+        stages = []
+        char_names, char_rules = [], []
+
+        def flush_chars():
+            if char_rules:
+                table = _TranslateTable(list(char_rules))
+                stages.append(("+".join(char_names), lambda t, tb=table: t.translate(tb)))
+                char_names.clear()
+                char_rules.clear()
+
+        for name, kind, payload in self.rules:
+            if kind == "replace":
+                singles = {k: v for k, v in payload.items() if len(k) == 1}
+                multis = {k: v for k, v in payload.items() if len(k) > 1}
+
+                if multis:
+                    flush_chars()
+                    pattern = re.compile("|".join(
+                        re.escape(k) for k in sorted(multis, key=len, reverse=True)
+                    ))
+                    firsts = {k[0] for k in multis}
+
+                    def run(t, p=pattern, m=multis, f=firsts):
+                        if not any(c in t for c in f):
+                            return t  # cheap guard: nothing to replace
+                        return p.sub(lambda mo: m[mo.group(0)], t)
+
+                    stages.append((f"{name}[multi]", run))
+
+                if singles:
+                    char_names.append(name)
+                    char_rules.append(
+                        lambda t, m=singles: "".join(m.get(c, c) for c in t)
+                    )
+
+            elif kind == "keep_only":
+                char_names.append(name)
+                char_rules.append(lambda t, p=payload: p.sub("", t))
+
+            elif kind == "regex":
+                flush_chars()
+                pattern, repl = payload
+                stages.append((name, lambda t, p=pattern, r=repl: p.sub(r, t)))
+
+            elif kind == "collapse":
+                flush_chars()
+                stages.append((name, lambda t: " ".join(t.split())))
+
+        flush_chars()
+        self._stages = stages
+        return stages
+
+    # ---- Execution ----
+    def clean(self, text):
+        stages = self._stages or self._compile()
+        for name, run in stages:
+            start = time.perf_counter()
+            text = run(text)
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+        return text
+
+    def clean_pages(self, pages):
+        """Lazily clean an iterable of page texts, one page at a time."""
+        for page in pages:
+            cleaned = self.clean(page or "")
+            if cleaned:
+                yield cleaned
+
+    def report(self):
+        total = sum(self.timings.values())
+        print("\n⏱️ Cleaning stage timings:")
+        for name, seconds in self.timings.items():
+            share = (seconds / total * 100) if total else 0
+            print(f"   {name:<45} {seconds * 1000:9.2f} ms ({share:5.1f}%)")
+        return dict(self.timings)
+
+    @classmethod
+    def default(cls):
+        """
+        The original clean_text rules, reordered so the dash fixes take
+        effect. This intentionally changes the output:
+
+        - en/em dashes (and mis-encoded "â€“") become "-" instead of being
+          stripped: '2010–2020' → '2010-2020' (was '20102020') and
+          'foo – bar' → 'foo - bar' (was 'foo  bar');
+        - whitespace is collapsed last, after stripping, so removed
+          characters leave no double spaces, and leading/trailing
+          whitespace is trimmed.
+
+        Quotes (plain, curly or mis-encoded) are not in the allow-list and are
+        still dropped, so there is no quote-normalization rule.
+        """
+        return (
+            cls()
+            .replace("fix_encoding", {"â€“": "-"})
+            .replace("normalize_dashes", {"–": "-", "—": "-"})
+            .keep_only("remove_special_chars", r"A-Za-z0-9\s.,;:!?()-")
+            .collapse_whitespace()
+        )
+
+
 class CleaningText:
     def __init__ (self,file_path):
         self.file_path = file_path
         print(f"DocumentManager initialized with file: {self.file_path}")
         self.content = ""
+        self.cache = PdfTextCache()
+        self.pipeline = CleaningPipeline.default()
 
     def add_context(self):
         print("Loading document...")
         print(f"File path: {self.file_path}")
 
-        reader = PdfReader(self.file_path)
-
-        if reader.is_encrypted:
-            raise Exception("PDF is password-protected and cannot be read.")
-
-        total_pages = len(reader.pages)
-        start_page = 1
-        end_page = total_pages
-
-        text_per_page = []
-        page_data = []
-
-
-        print(f"Total pages detected: {total_pages}")
-        print("Starting text extraction...\n")
-
-        for page_number in range(start_page - 1, end_page):
-            page = reader.pages[page_number]
-            page_text = page.extract_text() or ""
-            text_per_page.append(page_text)
-            page_details = {
-                "page_num": page_number + 1,
-                "content": page_text
-            }
-            page_data.append(page_details)
-            # 🔹 Progress indicator
-            progress = ((page_number + 1) / total_pages) * 100
-            print(
-                f"📄 Processing page {page_number + 1}/{total_pages} "
-                f"({progress:.2f}%)",
-                end="\r"
-            )
+        text_per_page = list(self.cache.load(
+            self.file_path, lambda: extract_pdf_pages(self.file_path)
+        ))
         self.text_data = text_per_page
 
         print("\n✅ PDF extraction completed.")
 
-    def clean_text(self):
-        content = " ".join(self.text_data)
-        before_text = content
-
-        # Remove extra whitespace
-        content = re.sub(r"\s+", " ", content)
-
-        # Normalize line breaks
-        content = re.sub(r"(?<=\w)\n(?=\w)", " ", content)
-        content = re.sub(r"\r\n|\r", "\n", content)
-
-        # Remove special characters
-        content = re.sub(r"[^A-Za-z0-9\s.,;:!?()-]", "", content)
-
-        # Fix encoding issues (simple example)
-        content = content.replace("â€“", "-").replace("â€˜", "'").replace("â€™", "'")
-
-        # Normalize quotes and dashes
-        content = content.replace("“", '"').replace("”", '"')
-        content = content.replace("‘", "'").replace("’", "'")
-        content = content.replace("–", "-").replace("—", "-")
+    def clean_text(self, pages=None):
+        """
+        Clean page texts (self.text_data by default, or any page iterator)
+        with the compiled pipeline, page by page.
+        """
+        pages = self.text_data if pages is None else pages
+        content = " ".join(self.pipeline.clean_pages(pages))
+        self.pipeline.report()
 
         self.cleaned_text = content
         print(content)
         return content
+
+    def clean_text_stream(self):
+        """
+        Extract and clean pages lazily without holding the raw text,
+        yielding one cleaned page at a time.
+        """
+        cached = self.cache.get(self.file_path)
+        if cached is not None:
+            pages = iter(cached)  # decompresses one page at a time
+        else:
+            reader = PdfReader(self.file_path)
+            pages = (page.extract_text() or "" for page in reader.pages)
+        yield from self.pipeline.clean_pages(pages)
         
 
-readPdf = CleaningText("Sample.pdf")
-readPdf.add_context()
-readPdf.clean_text()
-# readPdf.chunking_by_word()
+if __name__ == "__main__":
+    readPdf = CleaningText("Sample.pdf")
+    readPdf.add_context()
+    readPdf.clean_text()
+    # readPdf.chunking_by_word()
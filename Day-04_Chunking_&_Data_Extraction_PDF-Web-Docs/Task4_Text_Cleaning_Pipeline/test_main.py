@@ -0,0 +1,24 @@
+import unittest
+
+from main import CleaningPipeline
+
+
+class DefaultCleaningPipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = CleaningPipeline.default()
+
+    def test_dashes_are_normalised_not_stripped(self):
+        self.assertEqual(self.pipeline.clean("2010–2020"), "2010-2020")
+        self.assertEqual(self.pipeline.clean("foo – bar"), "foo - bar")
+        self.assertEqual(self.pipeline.clean("a—b â€“ c"), "a-b - c")
+
+    def test_quotes_are_dropped(self):
+        self.assertEqual(self.pipeline.clean("“it’s” 'x' \"y\" â€™z"), "its x y z")
+
+    def test_whitespace_is_collapsed_and_trimmed(self):
+        self.assertEqual(self.pipeline.clean("  Hello,\r\n\tworld!  "), "Hello, world!")
+        self.assertEqual(self.pipeline.clean("a ★ b"), "a b")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,35 +1,565 @@
 # task5_chunk_metadata.py
 import os
 import json
+import math
+import zlib
+import hashlib
+import shutil
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from pypdf import PdfReader
+from pypdf import PdfReader, __version__ as PYPDF_VERSION
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+# ---- On-disk extraction cache ----
+
+class CachedPages:
+    """Read-only view of cached page texts; any page can be read on its own."""
+
+    def __init__(self, data_path, offsets):
+        self.data_path = data_path
+        self.offsets = offsets  # [start, end) byte range of each page's blob
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, page_index):
+        start, end = self.offsets[page_index]
+        with open(self.data_path, "rb") as f:
+            f.seek(start)
+            return zlib.decompress(f.read(end - start)).decode("utf-8")
+
+    def __iter__(self):
+        with open(self.data_path, "rb") as f:
+            for start, end in self.offsets:
+                f.seek(start)
+                yield zlib.decompress(f.read(end - start)).decode("utf-8")
+
+
+class PdfTextCache:
+    """
+    Extracted page text cached on disk, keyed by the PDF's content hash and
+    the pypdf version. A size+mtime index avoids re-hashing unchanged files.
+    Each page is zlib-compressed separately so pages are randomly addressable.
+    """
+
+    def __init__(self, cache_dir=".pdf_cache", extractor_version=PYPDF_VERSION):
+        self.cache_dir = cache_dir
+        self.extractor_version = extractor_version
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.index_path = os.path.join(cache_dir, "fingerprints.json")
+        self._fingerprints = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._fingerprints = json.load(f)
+
+    def _key(self, file_path):
+        stat = os.stat(file_path)
+        fast_key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        digest = self._fingerprints.get(fast_key)
+
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(block)
+            digest = sha.hexdigest()
+
+            self._fingerprints[fast_key] = digest
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump(self._fingerprints, f)
+
+        return f"{digest[:32]}-pypdf{self.extractor_version}"
+
+    def get(self, file_path):
+        key = self._key(file_path)
+        meta_path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return CachedPages(os.path.join(self.cache_dir, f"{key}.bin"), meta["offsets"])
+
+    def put(self, file_path, pages):
+        key = self._key(file_path)
+        data_path = os.path.join(self.cache_dir, f"{key}.bin")
+        offsets = []
+        pos = 0
+
+        with open(data_path + ".tmp", "wb") as f:
+            for text in pages:
+                blob = zlib.compress(text.encode("utf-8"), 6)
+                f.write(blob)
+                offsets.append([pos, pos + len(blob)])
+                pos += len(blob)
+        os.replace(data_path + ".tmp", data_path)
+
+        # Written last, so an interrupted put never looks like a cache hit
+        with open(os.path.join(self.cache_dir, f"{key}.json"), "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.basename(file_path), "offsets": offsets}, f)
+
+        return CachedPages(data_path, offsets)
+
+    def load(self, file_path, extract):
+        """Return cached pages, calling extract() and caching on a miss."""
+        cached = self.get(file_path)
+        if cached is not None:
+            print(f"⚡ Extraction cache hit: {len(cached)} pages")
+            return cached
+
+        print("Extraction cache miss → extracting pages")
+        return self.put(file_path, extract())
+
+
+# ---- Parallel page-sharded extraction ----
+
+def _extract_page_range(file_path, start, end):
+    """Worker: open a private PdfReader and extract pages [start, end)."""
+    reader = PdfReader(file_path)
+    return start, [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def extract_pages_parallel(file_path, total_pages, workers=None, shard_size=None):
+    """
+    Extract text from every page of a PDF, splitting the page range into
+    shards across a process pool. Each worker opens its own PdfReader and
+    results are merged back in page order.
+    """
+    workers = workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, math.ceil(total_pages / (workers * 4)))
+    shards = [
+        (start, min(start + shard_size, total_pages))
+        for start in range(0, total_pages, shard_size)
+    ]
+
+    pages = [""] * total_pages
+    done = 0
+    next_report = 10
+
+    def collect(start, texts):
+        nonlocal done, next_report
+        pages[start:start + len(texts)] = texts
+        done += len(texts)
+        percent = done * 100 // total_pages if total_pages else 100
+        if percent >= next_report or done == total_pages:
+            print(f"📄 Extracted {done}/{total_pages} pages ({percent}%)")
+            next_report = (percent // 10 + 1) * 10
+
+    if workers == 1 or len(shards) <= 1:
+        for start, end in shards:
+            collect(*_extract_page_range(file_path, start, end))
+        return pages
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+        futures = [
+            pool.submit(_extract_page_range, file_path, start, end)
+            for start, end in shards
+        ]
+        for future in as_completed(futures):
+            collect(*future.result())
+
+    return pages
+
+
+def extract_pdf_pages(file_path):
+    """Open the PDF, check it is readable and extract all pages in parallel."""
+    reader = PdfReader(file_path)
+
+    if reader.is_encrypted:
+        raise Exception("PDF is password-protected and cannot be read.")
+
+    total_pages = len(reader.pages)
+    print(f"Total pages detected: {total_pages}")
+    print("Starting text extraction...\n")
+    return extract_pages_parallel(file_path, total_pages)
+
+
+# ---- Streaming JSONL chunk / embedding files ----
+
+class JsonlWriter:
+    """
+    Append-only JSONL writer for chunk or embedding records.
+
+    A path ending in ".zst" is written as independent zstd frames of
+    `frame_records` lines each, with a "<path>.idx" sidecar listing
+    "offset size rows" per frame. Reopening an existing file resumes it:
+    a torn last line (plain) or unindexed frame (zstd) is truncated and
+    `count` tells the producer how many records to skip.
+
+    `fingerprint` identifies what is being exported (source and
+    parameters). It is stored as the first line of the sidecar, and an
+    existing file written under a different fingerprint is started over
+    instead of resumed, so a stale export is never extended.
+    """
+
+    def __init__(self, path, frame_records=1000, level=3, fingerprint=None):
+        self.path = path
+        self.compressed = path.endswith(".zst")
+        self.index_path = path + ".idx"
+        self.frame_records = frame_records
+        self.level = level
+        self.fingerprint = fingerprint
+        self._buffer = []
+
+        if self.compressed:
+            import zstandard
+            self._compressor = zstandard.ZstdCompressor(level=level)
+
+        resume = os.path.exists(path) and self._stored_fingerprint() == fingerprint
+        if resume:
+            self.count = self._recover()
+        else:
+            # The sidecar goes first, so data never exists without its fingerprint
+            self._write_index([])
+            open(path, "wb").close()
+            self.count = 0
+        self._file = open(path, "ab")
+
+    def _stored_fingerprint(self):
+        if not os.path.exists(self.index_path):
+            return None
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            parts = f.readline().split()
+        return parts[1] if len(parts) == 2 and parts[0] == "fingerprint" else None
+
+    def _write_index(self, frames):
+        if not self.compressed and self.fingerprint is None:
+            if os.path.exists(self.index_path):
+                os.remove(self.index_path)
+            return
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            if self.fingerprint is not None:
+                f.write(f"fingerprint {self.fingerprint}\n")
+            f.writelines(f"{o} {n} {r}\n" for o, n, r in frames)
+
+    def _recover(self):
+        if self.compressed:
+            size = os.path.getsize(self.path)
+            frames = read_frame_index(self.index_path)
+            frames = [f for f in frames if f[0] + f[1] <= size]
+            end = frames[-1][0] + frames[-1][1] if frames else 0
+            os.truncate(self.path, end)
+            self._write_index(frames)
+            return sum(r for _, _, r in frames)
+
+        count, last_newline, pos = 0, 0, 0
+        with open(self.path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                newlines = block.count(b"\n")
+                if newlines:
+                    count += newlines
+                    last_newline = pos + block.rindex(b"\n") + 1
+                pos += len(block)
+        os.truncate(self.path, last_newline)
+        return count
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        if self.compressed:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.frame_records:
+                self._flush_frame()
+        else:
+            self._file.write(line.encode("utf-8"))
+        self.count += 1
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def _flush_frame(self):
+        if not self._buffer:
+            return
+        frame = self._compressor.compress("".join(self._buffer).encode("utf-8"))
+        offset = self._file.tell()
+        self._file.write(frame)
+        self._file.flush()
+        # The index line is the commit point for the frame
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(f"{offset} {len(frame)} {len(self._buffer)}\n")
+        self._buffer = []
+
+    def close(self):
+        if self.compressed:
+            self._flush_frame()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_frame_index(index_path):
+    if not os.path.exists(index_path):
+        return []
+    frames = []
+    with open(index_path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3:
+                frames.append(tuple(int(x) for x in parts))
+    return frames
+
+
+def iter_jsonl(path, start=0, end=None):
+    """
+    Stream records whose line (plain) or frame (zstd) starts in the byte
+    range [start, end). Shards from jsonl_shards() cover every record
+    exactly once.
+    """
+    if path.endswith(".zst"):
+        import zstandard
+        decompressor = zstandard.ZstdDecompressor()
+        with open(path, "rb") as f:
+            for offset, size, _ in read_frame_index(path + ".idx"):
+                if offset < start or (end is not None and offset >= end):
+                    continue
+                f.seek(offset)
+                text = decompressor.decompress(f.read(size)).decode("utf-8")
+                for line in text.splitlines():
+                    yield json.loads(line)
+        return
+
+    with open(path, "rb") as f:
+        if start > 0:
+            # Skip the line that straddles `start`; the previous shard owns it
+            f.seek(start - 1)
+            f.readline()
+        while end is None or f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.endswith(b"\n"):  # ignore a torn last line
+                yield json.loads(line)
+
+
+def jsonl_shards(path, num_shards):
+    size = os.path.getsize(path)
+    step = math.ceil(size / num_shards) if size else 1
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def _process_shard(path, start, end, shard_fn):
+    return shard_fn(iter_jsonl(path, start, end))
+
+
+def process_jsonl_parallel(path, shard_fn, workers=None):
+    """
+    Run `shard_fn(records_iterator)` over byte-range shards in a process
+    pool and return the per-shard results in file order. `shard_fn` must
+    be a top-level (picklable) function; each worker streams its shard.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = jsonl_shards(path, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_process_shard, path, start, end, shard_fn)
+            for start, end in shards
+        ]
+        return [future.result() for future in futures]
+
+
+# ---- Columnar chunk store ----
+
+CHUNK_COLUMNS = {
+    "chunk_id": np.int64,
+    "source_id": np.int32,
+    "page_number": np.int32,
+    "chunk_index": np.int32,
+    "start_char": np.int64,
+    "end_char": np.int64,
+    "word_count": np.int32,
+    "char_count": np.int32,
+    "timestamp": np.float64,   # POSIX seconds
+    "text_start": np.int64,    # byte range of the chunk in text.bin
+    "text_end": np.int64,
+}
+
+
+class ColumnarChunkStore:
+    """
+    Append-only chunk store: one raw NumPy file per metadata column plus a
+    single UTF-8 text blob addressed by byte offsets.
+
+    Reads are memory-mapped, so filtering touches only the columns it needs
+    and a million chunks filter in milliseconds. `meta.json` holds the
+    committed row count and is written last (atomically), so an append that
+    dies halfway is simply truncated away on the next open.
+    The preview field is not stored; it is sliced from the text on read.
+    """
+
+    def __init__(self, directory="chunk_store"):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, "columns"), exist_ok=True)
+        self.text_path = os.path.join(directory, "text.bin")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self._mmaps = {}
+
+        self.meta = {"rows": 0, "text_bytes": 0, "sources": []}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def _column_path(self, name):
+        return os.path.join(self.directory, "columns", f"{name}.bin")
+
+    def _truncate_to_committed(self):
+        """Drop bytes left behind by an interrupted append."""
+        rows = self.meta["rows"]
+        for name, dtype in CHUNK_COLUMNS.items():
+            path = self._column_path(name)
+            if os.path.exists(path):
+                os.truncate(path, rows * np.dtype(dtype).itemsize)
+        if os.path.exists(self.text_path):
+            os.truncate(self.text_path, self.meta["text_bytes"])
+
+    def _source_id(self, source):
+        sources = self.meta["sources"]
+        if source not in sources:
+            sources.append(source)
+        return sources.index(source)
+
+    def append(self, chunks):
+        if not chunks:
+            return
+        self._truncate_to_committed()
+
+        blobs = [c["text"].encode("utf-8") for c in chunks]
+        sizes = np.fromiter((len(b) for b in blobs), dtype=np.int64, count=len(blobs))
+        text_end = self.meta["text_bytes"] + np.cumsum(sizes)
+
+        columns = {
+            "chunk_id": [c["chunk_id"] for c in chunks],
+            "source_id": [self._source_id(c["source"]) for c in chunks],
+            "page_number": [c["page_number"] for c in chunks],
+            "chunk_index": [c["chunk_index"] for c in chunks],
+            "start_char": [c["start_char"] for c in chunks],
+            "end_char": [c["end_char"] for c in chunks],
+            "word_count": [c["word_count"] for c in chunks],
+            "char_count": [c["char_count"] for c in chunks],
+            "timestamp": [
+                datetime.fromisoformat(c["timestamp"]).timestamp() for c in chunks
+            ],
+            "text_start": text_end - sizes,
+            "text_end": text_end,
+        }
+
+        with open(self.text_path, "ab") as f:
+            f.write(b"".join(blobs))
+        for name, dtype in CHUNK_COLUMNS.items():
+            with open(self._column_path(name), "ab") as f:
+                f.write(np.asarray(columns[name], dtype=dtype).tobytes())
+
+        # Commit point
+        self.meta["rows"] += len(chunks)
+        self.meta["text_bytes"] = int(text_end[-1])
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+        self._mmaps = {}
+        print(f"🗄️ Appended {len(chunks)} chunks → {self.directory} ({len(self)} total)")
+
+    def column(self, name):
+        if name not in self._mmaps:
+            dtype = CHUNK_COLUMNS[name]
+            if len(self) == 0:
+                self._mmaps[name] = np.empty(0, dtype=dtype)
+            else:
+                self._mmaps[name] = np.memmap(
+                    self._column_path(name), dtype=dtype, mode="r", shape=(len(self),)
+                )
+        return self._mmaps[name]
+
+    def _text_blob(self):
+        if "_text" not in self._mmaps:
+            if self.meta["text_bytes"] == 0:
+                self._mmaps["_text"] = b""
+            else:
+                self._mmaps["_text"] = np.memmap(
+                    self.text_path, dtype=np.uint8, mode="r",
+                    shape=(self.meta["text_bytes"],)
+                )
+        return self._mmaps["_text"]
+
+    def filter(self, min_words=None, max_words=None, page_number=None, source=None):
+        """Vectorized metadata filter; returns the matching row indices."""
+        mask = np.ones(len(self), dtype=bool)
+        if min_words is not None:
+            mask &= self.column("word_count") >= min_words
+        if max_words is not None:
+            mask &= self.column("word_count") <= max_words
+        if page_number is not None:
+            mask &= self.column("page_number") == page_number
+        if source is not None:
+            if source not in self.meta["sources"]:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.column("source_id") == self.meta["sources"].index(source)
+        return np.flatnonzero(mask)
+
+    def text(self, row):
+        start = int(self.column("text_start")[row])
+        end = int(self.column("text_end")[row])
+        return bytes(self._text_blob()[start:end]).decode("utf-8")
+
+    def get(self, row):
+        text = self.text(row)
+        return {
+            "chunk_id": int(self.column("chunk_id")[row]),
+            "source": self.meta["sources"][int(self.column("source_id")[row])],
+            "page_number": int(self.column("page_number")[row]),
+            "chunk_index": int(self.column("chunk_index")[row]),
+            "start_char": int(self.column("start_char")[row]),
+            "end_char": int(self.column("end_char")[row]),
+            "word_count": int(self.column("word_count")[row]),
+            "char_count": int(self.column("char_count")[row]),
+            "timestamp": datetime.fromtimestamp(
+                float(self.column("timestamp")[row])
+            ).isoformat(),
+            "preview": text[:50],
+            "text": text,
+        }
+
+    def rows(self, indices):
+        return [self.get(int(i)) for i in indices]
+
+
 class Chunk:
     def __init__(self, file_path):
         self.file_path = file_path
         self.chunks = []
+        self.pages = []
         self.chunk_size = 500  # characters per chunk
         self.chunk_overlap = 50  # overlapping characters
+        self.cache = PdfTextCache()
         print(f"DocumentManager initialized with file: {self.file_path}")
 
     def add_context(self):
-        print("Loading document...")
-        reader = PdfReader(self.file_path)
-
-        if reader.is_encrypted:
-            raise Exception("PDF is password-protected and cannot be read.")
+        self.chunks = list(self.iter_chunks())
+        print(f"\n✅ PDF processed into {len(self.chunks)} chunks.")
 
-        total_pages = len(reader.pages)
-        print(f"Total pages detected: {total_pages}")
+    def iter_chunks(self):
+        """Yield chunks page by page without holding them all in memory."""
+        print("Loading document...")
+        page_texts = self.cache.load(
+            self.file_path, lambda: extract_pdf_pages(self.file_path)
+        )
+        self.pages = page_texts
 
         chunk_id = 1
-
-        for page_number, page in enumerate(reader.pages, start=1):
-            page_text = page.extract_text() or ""
+        for page_number, page_text in enumerate(page_texts, start=1):
             text_length = len(page_text)
             start = 0
             chunk_index = 1
@@ -53,19 +583,45 @@ class Chunk:
                     "text": chunk_text,
                 }
 
-                self.chunks.append(chunk)
+                yield chunk
                 chunk_id += 1
                 chunk_index += 1
                 start += self.chunk_size - self.chunk_overlap
 
-        print(f"\n✅ PDF processed into {len(self.chunks)} chunks.")
-
     # Export all chunks to JSON
     def export_chunks_to_json(self, output_file="chunks.json"):
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(self.chunks, f, ensure_ascii=False, indent=4)
         print(f"Chunks exported to {output_file}")
 
+    # Stream chunks to JSONL (.zst → zstd); resumes an interrupted export
+    def export_chunks_to_jsonl(self, output_file="chunks.jsonl"):
+        chunks = self.iter_chunks()
+        with JsonlWriter(output_file, fingerprint=self.export_fingerprint()) as writer:
+            skip = writer.count
+            if skip:
+                print(f"↩️ Resuming {output_file} after {skip} chunks")
+            for chunk in itertools.islice(chunks, skip, None):
+                writer.write(chunk)
+        print(f"Chunks exported to {output_file} ({writer.count} records)")
+
+    # Identifies the source PDF (content hash + extractor) and chunking parameters
+    def export_fingerprint(self):
+        key = json.dumps({
+            "source": self.cache._key(self.file_path),
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+        }, sort_keys=True)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    # Write all chunks to a columnar store (replaces the JSON export)
+    def export_chunks_to_store(self, directory="chunk_store", overwrite=True):
+        if overwrite and os.path.isdir(directory):
+            shutil.rmtree(directory)
+        store = ColumnarChunkStore(directory)
+        store.append(self.chunks)
+        return store
+
     # Filter chunks by metadata
     def filter_chunks(self, min_words=None, max_words=None, page_number=None):
         results = self.chunks
@@ -92,16 +648,126 @@ class Chunk:
             "average_words_per_chunk": avg_words,
             "average_chars_per_chunk": avg_chars,
         }
-    
 
-chunk_info = Chunk("Sample.pdf")
-chunk_info.add_context()
-chunk_info.export_chunks_to_json()
 
-stats = chunk_info.get_chunk_statistics()
-print("\n📊 Chunk Statistics:", stats)
+class HierarchicalIndex:
+    """
+    Two-level small-to-big index over a loaded Chunk.
+
+    Only the small child chunks are embedded, so matching stays precise.
+    Each child points at its parent page through page_number and its char
+    offsets, so the LLM context is rebuilt by slicing the page text:
+
+    - parent="page":   every hit expands to its whole page, each page once.
+    - parent="window": hits on the same page are widened by `context_chars`
+                       on both sides, then overlapping or adjacent spans
+                       are merged so no text is sent twice.
+    """
+
+    def __init__(self, chunk_info, model_name="all-MiniLM-L6-v2",
+                 parent="page", context_chars=500):
+        from sentence_transformers import SentenceTransformer
+
+        if parent not in ("page", "window"):
+            raise ValueError("parent must be 'page' or 'window'")
+
+        self.chunk_info = chunk_info
+        self.parent = parent
+        self.context_chars = context_chars
+        self.model = SentenceTransformer(model_name)
+        self.embeddings = None
+
+    def build(self):
+        texts = [c["text"].replace("\n", " ") for c in self.chunk_info.chunks]
+        self.embeddings = self.model.encode(
+            texts, convert_to_numpy=True, normalize_embeddings=True
+        )
+        print(f"🧱 Indexed {len(texts)} child chunks")
+
+    def _spans(self, hits):
+        """Group child hits by page and turn them into parent spans."""
+        by_page = {}
+        for chunk, score in hits:
+            by_page.setdefault(chunk["page_number"], []).append((chunk, score))
+
+        spans = []
+        for page_number, page_hits in by_page.items():
+            page_text = self.chunk_info.pages[page_number - 1]
+            best = max(score for _, score in page_hits)
+            child_ids = [c["chunk_id"] for c, _ in page_hits]
+
+            if self.parent == "page":
+                spans.append((best, page_number, 0, len(page_text), child_ids))
+                continue
+
+            ranges = sorted(
+                (max(0, c["start_char"] - self.context_chars),
+                 min(len(page_text), c["end_char"] + self.context_chars),
+                 s, c["chunk_id"])
+                for c, s in page_hits
+            )
+            merged = []
+            for r_start, r_end, r_score, r_id in ranges:
+                if merged and r_start <= merged[-1][2]:  # overlap or touch
+                    last = merged[-1]
+                    last[0] = max(last[0], r_score)
+                    last[2] = max(last[2], r_end)
+                    last[3].append(r_id)
+                else:
+                    merged.append([r_score, r_start, r_end, [r_id]])
+
+            for score, start, end, ids in merged:
+                spans.append((score, page_number, start, end, ids))
+
+        spans.sort(key=lambda span: -span[0])
+        return spans
+
+    def search(self, query, k=5):
+        if self.embeddings is None:
+            self.build()
+
+        query_emb = self.model.encode(
+            query, convert_to_numpy=True, normalize_embeddings=True
+        )
+        scores = self.embeddings @ query_emb
+        top = np.argsort(-scores)[:k]
+        hits = [(self.chunk_info.chunks[i], float(scores[i])) for i in top]
+
+        results = []
+        for score, page_number, start, end, child_ids in self._spans(hits):
+            results.append({
+                "page_number": page_number,
+                "start_char": start,
+                "end_char": end,
+                "score": round(score, 4),
+                "child_chunk_ids": child_ids,
+                "text": self.chunk_info.pages[page_number - 1][start:end],
+            })
+        return results
+
+    def build_context(self, query, k=5):
+        results = self.search(query, k)
+        return "\n\n".join(
+            f"[Page {r['page_number']}]\n{r['text']}" for r in results
+        )
+
+
+if __name__ == "__main__":
+    chunk_info = Chunk("Sample.pdf")
+    chunk_info.add_context()
+    store = chunk_info.export_chunks_to_store()
+
+    chunk_info.export_chunks_to_jsonl("chunks.jsonl.zst")
+
+    stats = chunk_info.get_chunk_statistics()
+    print("\n📊 Chunk Statistics:", stats)
+
+    # Example: Filter chunks with more than 50 words
+    filtered = store.filter(min_words=50)
+    print(f"\nFiltered chunks (>=50 words): {len(filtered)}")
 
-# Example: Filter chunks with more than 50 words
-filtered = chunk_info.filter_chunks(min_words=50)
-print(f"\nFiltered chunks (>=50 words): {len(filtered)}")
+    # Example: small-to-big retrieval (children matched, pages returned)
+    # index = HierarchicalIndex(chunk_info, parent="window")
+    # for hit in index.search("Who owned the chest?", k=4):
+    #     print(hit["page_number"], hit["child_chunk_ids"], hit["text"][:80])
 
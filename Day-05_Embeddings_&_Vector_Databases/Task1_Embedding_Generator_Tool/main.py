@@ -1,4 +1,4 @@
-import os,re,sys
+import os,re,sys,time
 from pypdf import PdfReader
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -26,11 +26,174 @@ client = OpenAI(
 
 
 load_dotenv()
+
+
+class _TranslateTable(dict):
+    """
+    str.translate mapping built lazily: the first time a character is seen,
+    every merged character-level rule is applied to it in order and the
+    result is cached, so all of them run in a single translate pass.
+    """
+
+    def __init__(self, char_rules):
+        super().__init__()
+        self.char_rules = char_rules
+
+    def __missing__(self, code):
+        text = chr(code)
+        for rule in self.char_rules:
+            text = rule(text)
+        value = text if text else None  # None deletes the character
+        self[code] = value
+        return value
+
+
+class CleaningPipeline:
+    """
+    Composable text cleaning rules, compiled into as few passes as possible.
+
+    - Adjacent character-level rules (single-char replacements, allow-lists)
+      are merged into one str.translate table.
+    - Multi-character replacements are merged into one compiled regex.
+    - Timings are collected per compiled stage.
+    """
+
+    def __init__(self):
+        self.rules = []
+        self.timings = {}
+        self._stages = None
+
+    # ---- Rule builders ----
+    def replace(self, name, mapping):
+        self.rules.append((name, "replace", dict(mapping)))
+        self._stages = None
+        return self
+
+    def keep_only(self, name, char_class):
+        """Delete every character not matched by the regex character class."""
+        self.rules.append((name, "keep_only", re.compile(f"[^{char_class}]")))
+        self._stages = None
+        return self
+
+    def regex(self, name, pattern, repl):
+        self.rules.append((name, "regex", (re.compile(pattern), repl)))
+        self._stages = None
+        return self
+
+    def collapse_whitespace(self, name="collapse_whitespace"):
+        self.rules.append((name, "collapse", None))
+        self._stages = None
+        return self
+
+    # ---- Compilation ----
+    def _compile(self):
+        stages = []
+        char_names, char_rules = [], []
+
+        def flush_chars():
+            if char_rules:
+                table = _TranslateTable(list(char_rules))
+                stages.append(("+".join(char_names), lambda t, tb=table: t.translate(tb)))
+                char_names.clear()
+                char_rules.clear()
+
+        for name, kind, payload in self.rules:
+            if kind == "replace":
+                singles = {k: v for k, v in payload.items() if len(k) == 1}
+                multis = {k: v for k, v in payload.items() if len(k) > 1}
+
+                if multis:
+                    flush_chars()
+                    pattern = re.compile("|".join(
+                        re.escape(k) for k in sorted(multis, key=len, reverse=True)
+                    ))
+                    firsts = {k[0] for k in multis}
+
+                    def run(t, p=pattern, m=multis, f=firsts):
+                        if not any(c in t for c in f):
+                            return t  # cheap guard: nothing to replace
+                        return p.sub(lambda mo: m[mo.group(0)], t)
+
+                    stages.append((f"{name}[multi]", run))
+
+                if singles:
+                    char_names.append(name)
+                    char_rules.append(
+                        lambda t, m=singles: "".join(m.get(c, c) for c in t)
+                    )
+
+            elif kind == "keep_only":
+                char_names.append(name)
+                char_rules.append(lambda t, p=payload: p.sub("", t))
+
+            elif kind == "regex":
+                flush_chars()
+                pattern, repl = payload
+                stages.append((name, lambda t, p=pattern, r=repl: p.sub(r, t)))
+
+            elif kind == "collapse":
+                flush_chars()
+                stages.append((name, lambda t: " ".join(t.split())))
+
+        flush_chars()
+        self._stages = stages
+        return stages
+
+    # ---- Execution ----
+    def clean(self, text):
+        stages = self._stages or self._compile()
+        for name, run in stages:
+            start = time.perf_counter()
+            text = run(text)
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+        return text
+
+    def clean_pages(self, pages):
+        """Lazily clean an iterable of page texts, one page at a time."""
+        for page in pages:
+            cleaned = self.clean(page or "")
+            if cleaned:
+                yield cleaned
+
+    def report(self):
+        total = sum(self.timings.values())
+        print("\n⏱️ Cleaning stage timings:")
+        for name, seconds in self.timings.items():
+            share = (seconds / total * 100) if total else 0
+            print(f"   {name:<45} {seconds * 1000:9.2f} ms ({share:5.1f}%)")
+        return dict(self.timings)
+
+    @classmethod
+    def default(cls):
+        """
+        The original clean_text rules, reordered so the dash fixes take
+        effect. This intentionally changes the output:
+
+        - en/em dashes (and mis-encoded "â€“") become "-" instead of being
+          stripped: '2010–2020' → '2010-2020' (was '20102020') and
+          'foo – bar' → 'foo - bar' (was 'foo  bar');
+        - whitespace is collapsed last, after stripping, so removed
+          characters leave no double spaces, and leading/trailing
+          whitespace is trimmed.
+
+        Quotes (plain, curly or mis-encoded) are not in the allow-list and are
+        still dropped, so there is no quote-normalization rule.
+        """
+        return (
+            cls()
+            .replace("fix_encoding", {"â€“": "-"})
+            .replace("normalize_dashes", {"–": "-", "—": "-"})
+            .keep_only("remove_special_chars", r"A-Za-z0-9\s.,;:!?()-")
+            .collapse_whitespace()
+        )
+
+
 class EmbeddingGenerator:
     def __init__ (self,file_path):
         self.file_path = file_path
         print(f"DocumentManager initialized with file: {self.file_path}")
         self.content = ""
+        self.pipeline = CleaningPipeline.default()
 
     def add_context(self):
         print("Loading document...")
@@ -46,25 +209,12 @@ class EmbeddingGenerator:
         end_page = total_pages
         print(f"Total pages detected: {total_pages}")
         print("Starting text extraction...\n")
-        for page_number in range(start_page - 1, end_page):
-            page = reader.pages[page_number]
-            content = page.extract_text() or ""
-            content = re.sub(r"\s+", " ", content)
-
-            # Normalize line breaks
-            content = re.sub(r"(?<=\w)\n(?=\w)", " ", content)
-            content = re.sub(r"\r\n|\r", "\n", content)
-
-            # Remove special characters
-            content = re.sub(r"[^A-Za-z0-9\s.,;:!?()-]", "", content)
-
-            # Fix encoding issues (simple example)
-            content = content.replace("â€“", "-").replace("â€˜", "'").replace("â€™", "'")
-
-            # Normalize quotes and dashes
-            content = content.replace("“", '"').replace("”", '"')
-            content = content.replace("‘", "'").replace("’", "'")
-            content = content.replace("–", "-").replace("—", "-")
+        pages = (
+            reader.pages[page_number].extract_text() or ""
+            for page_number in range(start_page - 1, end_page)
+        )
+        content = " ".join(self.pipeline.clean_pages(pages))
+        self.pipeline.report()
 
         print("\n✅ PDF extraction completed.")
         # print('---------------',content)
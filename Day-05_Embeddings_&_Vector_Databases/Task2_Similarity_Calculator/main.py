@@ -40,6 +40,148 @@ def similarity_calculator(text1: str, text2: str):
     print("-" * 50)
 
 
+# ---- All-pairs similarity engine (N x M) ----
+
+def encode_texts(texts, batch_size: int = 256):
+    """
+    Batch-encode texts once into unit-length float32 vectors,
+    so cosine similarity becomes a plain dot product.
+    """
+    embs = model.encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+    return np.ascontiguousarray(embs, dtype=np.float32)
+
+
+def iter_similarity_tiles(left, right, block_size: int = 2048):
+    """
+    Yield (row_offset, col_offset, tile) where tile = left_block @ right_block.T.
+    Peak memory is one block_size x block_size float32 tile (16 MB at 2048).
+    """
+    for i in range(0, len(left), block_size):
+        rows = left[i:i + block_size]
+        for j in range(0, len(right), block_size):
+            yield i, j, rows @ right[j:j + block_size].T
+
+
+def top_k_per_row(left, right, k: int = 5, block_size: int = 2048,
+                  exclude_self: bool = False):
+    """
+    Top-k most similar right rows for every left row.
+    Returns (indices, scores), both shaped (len(left), k), best first.
+    Use exclude_self=True when left and right are the same set; k is then
+    capped at len(right) - 1 so no masked self slot is returned.
+    """
+    n = len(left)
+    k = min(k, len(right) - 1 if exclude_self else len(right))
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64), np.empty((n, 0), dtype=np.float32)
+    best_scores = np.full((n, k), -np.inf, dtype=np.float32)
+    best_idx = np.full((n, k), -1, dtype=np.int64)
+
+    for i, j, tile in iter_similarity_tiles(left, right, block_size):
+        if exclude_self:
+            rows = np.arange(i, i + tile.shape[0])
+            cols = rows - j
+            inside = (cols >= 0) & (cols < tile.shape[1])
+            tile[np.nonzero(inside)[0], cols[inside]] = -np.inf
+
+        kk = min(k, tile.shape[1])
+        part = np.argpartition(-tile, kk - 1, axis=1)[:, :kk]
+
+        # Merge this tile's candidates into the running top-k
+        rows = slice(i, i + tile.shape[0])
+        scores = np.hstack([best_scores[rows], np.take_along_axis(tile, part, axis=1)])
+        idx = np.hstack([best_idx[rows], part + j])
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best_scores[rows] = np.take_along_axis(scores, keep, axis=1)
+        best_idx[rows] = np.take_along_axis(idx, keep, axis=1)
+
+    order = np.argsort(-best_scores, axis=1)
+    return (np.take_along_axis(best_idx, order, axis=1),
+            np.take_along_axis(best_scores, order, axis=1))
+
+
+def threshold_join(left, right, threshold: float = 0.8,
+                   block_size: int = 2048, self_join: bool = False):
+    """
+    Yield (left_index, right_index, score) for every pair >= threshold.
+    With self_join=True only pairs with left_index < right_index are kept.
+    """
+    for i, j, tile in iter_similarity_tiles(left, right, block_size):
+        if self_join and j + tile.shape[1] <= i:
+            continue  # tile lies entirely below the diagonal
+
+        r, c = np.nonzero(tile >= threshold)
+        if self_join:
+            upper = (r + i) < (c + j)
+            r, c = r[upper], c[upper]
+
+        for a, b, score in zip(r + i, c + j, tile[r, c]):
+            yield int(a), int(b), float(score)
+
+
+def cluster_duplicates(n: int, pairs):
+    """
+    Union-find over threshold_join pairs.
+    Returns clusters (lists of indices) with more than one member.
+    """
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b, _ in pairs:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    groups = {}
+    for x in range(n):
+        groups.setdefault(find(x), []).append(x)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def all_pairs_similarity(texts_a, texts_b=None, mode: str = "topk",
+                         k: int = 5, threshold: float = 0.8,
+                         block_size: int = 2048):
+    """
+    Compare every text in texts_a with every text in texts_b
+    (or with itself when texts_b is None) without building the full matrix.
+
+    mode="topk"      → (indices, scores) arrays of shape (len(texts_a), k)
+    mode="threshold" → list of (i, j, score) pairs above threshold
+    """
+    left = encode_texts(texts_a)
+    self_join = texts_b is None
+    right = left if self_join else encode_texts(texts_b)
+
+    if mode == "topk":
+        return top_k_per_row(left, right, k, block_size, exclude_self=self_join)
+    if mode == "threshold":
+        return list(threshold_join(left, right, threshold, block_size, self_join))
+    raise ValueError("mode must be 'topk' or 'threshold'")
+
+
 # Tests
-similarity_calculator("dog", "puppy")
-similarity_calculator("dog", "computer")
+if __name__ == "__main__":
+    similarity_calculator("dog", "puppy")
+    similarity_calculator("dog", "computer")
+
+    texts = ["dog", "puppy", "computer", "laptop", "cat", "kitten"]
+    indices, scores = all_pairs_similarity(texts, mode="topk", k=2)
+    for text, row, row_scores in zip(texts, indices, scores):
+        print(f"{text:10} → " + ", ".join(
+            f"{texts[j]} ({sc:.4f})" for j, sc in zip(row, row_scores)
+        ))
+
+    pairs = all_pairs_similarity(texts, mode="threshold", threshold=0.6)
+    print("Near-duplicate clusters:", [
+        [texts[i] for i in group] for group in cluster_duplicates(len(texts), pairs)
+    ])
@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+
+from main import top_k_per_row
+
+
+class TopKPerRowTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        vecs = rng.normal(size=(6, 8)).astype(np.float32)
+        self.vecs = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+    def test_exclude_self_caps_k_below_set_size(self):
+        idx, scores = top_k_per_row(self.vecs, self.vecs, k=10, block_size=4,
+                                    exclude_self=True)
+        self.assertEqual(idx.shape, (6, 5))
+        self.assertTrue(np.all(idx >= 0))
+        self.assertTrue(np.all(np.isfinite(scores)))
+        for row, neighbours in enumerate(idx):
+            self.assertNotIn(row, neighbours)
+            self.assertEqual(sorted(neighbours), sorted(set(range(6)) - {row}))
+
+    def test_exclude_self_single_row_has_no_neighbours(self):
+        idx, scores = top_k_per_row(self.vecs[:1], self.vecs[:1], k=3,
+                                    exclude_self=True)
+        self.assertEqual(idx.shape, (1, 0))
+        self.assertEqual(scores.shape, (1, 0))
+
+    def test_matches_brute_force(self):
+        idx, scores = top_k_per_row(self.vecs, self.vecs, k=3, block_size=4)
+        expected = np.argsort(-(self.vecs @ self.vecs.T), axis=1)[:, :3]
+        np.testing.assert_array_equal(idx, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,69 @@
 
 from dotenv import load_dotenv
 import chromadb
+from collections import OrderedDict
+from sentence_transformers import SentenceTransformer
 load_dotenv()
 
+class EmbeddingGenerator:
+    """
+    Batched sentence-transformers embeddings with an in-memory LRU cache.
+
+    One instance per model is shared by every collection in the process
+    (EmbeddingGenerator.shared()), so each text is embedded once, with the
+    model we pick, and Chroma never falls back to its own embedding function.
+    """
+
+    _instances = {}
+
+    def __init__(self, model_name="all-MiniLM-L6-v2", batch_size=64, cache_size=50000):
+        self.model = SentenceTransformer(model_name)
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+
+    @classmethod
+    def shared(cls, model_name="all-MiniLM-L6-v2"):
+        if model_name not in cls._instances:
+            cls._instances[model_name] = cls(model_name)
+        return cls._instances[model_name]
+
+    def embed(self, texts):
+        """Embed a list of texts; only texts not seen before hit the model, in one batch."""
+        missing = [t for t in dict.fromkeys(texts) if t not in self.cache]
+        if missing:
+            vectors = self.model.encode(
+                missing,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            for text, vector in zip(missing, vectors):
+                self.cache[text] = vector.tolist()
+
+        embeddings = []
+        for text in texts:
+            self.cache.move_to_end(text)
+            embeddings.append(self.cache[text])
+
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return embeddings
+
+    def embed_query(self, text):
+        return self.embed([text])[0]
+
+
 class ChromaDBDocument:
-    def __init__ (self,collection_name):
+    def __init__ (self,collection_name,embedder=None):
         self.collection = collection_name
         print(f"Chromadb initializing")
         self.client = chromadb.Client()
+        self.embedder = embedder or EmbeddingGenerator.shared()
 
         self.collection = self.client.get_or_create_collection(
-            name=collection_name
+            name=collection_name,
+            embedding_function=None
         )
         print(f"Chromadb initialized with collection: {self.collection}")
 
@@ -34,13 +87,14 @@ class ChromaDBDocument:
         self.collection.add(
                 documents=documents,
                 ids=ids,
-                metadatas=metadatas
+                metadatas=metadatas,
+                embeddings=self.embedder.embed(documents)
             )
 
     def search(self):
         # Query for similar documents
         results = self.collection.query(
-            query_texts=["programming languages"],
+            query_embeddings=[self.embedder.embed_query("programming languages")],
             n_results=2
         )
 
@@ -1,50 +1,144 @@
 from dotenv import load_dotenv
+import time
+import hashlib
+import itertools
+import numpy as np
 import chromadb
 from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Tuple
 
 load_dotenv()
 
 class SemanticSearchEngine:
-    def __init__(self, collection_name: str, persist_path: Optional[str] = None):
-        """Initialize ChromaDB semantic search engine"""
+    def __init__(
+        self,
+        collection_name: str,
+        persist_path: Optional[str] = None,
+        batch_size: int = 1000,
+        embedding_batch_size: int = 64,
+        model: Optional[SentenceTransformer] = None
+    ):
+        """Initialize ChromaDB semantic search engine.
+
+        With persist_path the collection lives on disk (PersistentClient)
+        and survives restarts; without it the client is in-memory.
+        """
         print("Initializing ChromaDB...")
         if persist_path:
-            self.client = chromadb.Client(
-                chromadb.config.Settings(persist_directory=persist_path)
-            )
+            self.client = chromadb.PersistentClient(path=persist_path)
         else:
             self.client = chromadb.Client()
 
         self.collection = self.client.get_or_create_collection(
             name=collection_name
         )
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
-        print(f"ChromaDB ready with collection: {collection_name}")
+        # Chroma rejects writes above its max batch size
+        self.batch_size = min(batch_size, self.client.get_max_batch_size())
+        self.embedding_batch_size = embedding_batch_size
+        self.model = model or SentenceTransformer("all-MiniLM-L6-v2")
+        print(
+            f"ChromaDB ready with collection: {collection_name}"
+            f" ({self.collection.count()} documents)"
+        )
 
     # ------------------ Indexing ------------------
+    @staticmethod
+    def content_id(document: str, namespace: str = "") -> str:
+        """Stable ID from the content, so re-indexing the same text is a no-op upsert."""
+        return hashlib.sha1(f"{namespace}\x00{document}".encode("utf-8")).hexdigest()
+
     def index_documents(
         self,
         documents: List[str],
-        ids: List[str],
-        metadatas: Optional[List[Dict]] = None
+        ids: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict]] = None,
+        skip_existing: bool = False
     ):
-        """Add documents to ChromaDB (no hardcoded data)"""
-        if not documents or not ids:
-            raise ValueError("Documents and IDs are required")
+        """Upsert documents in batches (IDs default to content hashes)"""
+        if not documents:
+            raise ValueError("Documents are required")
+
+        if ids is None:
+            ids = [self.content_id(doc) for doc in documents]
 
         if len(documents) != len(ids):
             raise ValueError("Documents and IDs length mismatch")
 
-        embeddings = self.model.encode(documents).tolist()
+        if metadatas is not None and len(metadatas) != len(ids):
+            raise ValueError("Metadatas and IDs length mismatch")
+
+        records = zip(ids, documents, metadatas or itertools.repeat(None))
+        return self.upsert_stream(records, skip_existing=skip_existing)
+
+    def upsert_stream(
+        self,
+        records: Iterable[Tuple[str, str, Optional[Dict]]],
+        skip_existing: bool = False,
+        embeddings_fn=None
+    ) -> Dict:
+        """Bulk upsert (id, document, metadata) records in fixed-size batches.
+
+        Each batch is embedded in one encode call and written with one
+        upsert, so memory stays at one batch. Records repeating an ID within
+        a batch (e.g. identical texts under content-hash IDs) are collapsed,
+        last one wins. Missing or empty metadata is stored as None. With
+        skip_existing, IDs already in the collection are neither re-embedded
+        nor rewritten, which makes an interrupted load resumable.
+        """
+        embed = embeddings_fn or (lambda docs: self.model.encode(
+            docs,
+            batch_size=self.embedding_batch_size,
+            convert_to_numpy=True
+        ))
+        stats = {"upserted": 0, "skipped": 0, "duplicates": 0,
+                 "embed_seconds": 0.0, "write_seconds": 0.0}
+        records = iter(records)
+
+        while True:
+            batch = list(itertools.islice(records, self.batch_size))
+            if not batch:
+                break
+
+            # Chroma rejects duplicate IDs in one upsert; keep the last record
+            deduped = {}
+            for record_id, document, metadata in batch:
+                if metadata is not None and not isinstance(metadata, dict):
+                    raise ValueError(f"Metadata for {record_id!r} must be a dict or None")
+                deduped.pop(record_id, None)
+                deduped[record_id] = (record_id, document, metadata or None)
+            stats["duplicates"] += len(batch) - len(deduped)
+            batch = list(deduped.values())
+
+            if skip_existing:
+                existing = set(self.collection.get(
+                    ids=[r[0] for r in batch], include=[]
+                )["ids"])
+                stats["skipped"] += len(existing)
+                batch = [r for r in batch if r[0] not in existing]
+                if not batch:
+                    continue
+
+            ids, documents, metadatas = (list(col) for col in zip(*batch))
+
+            start = time.perf_counter()
+            embeddings = embed(documents)
+            stats["embed_seconds"] += time.perf_counter() - start
 
-        self.collection.add(
-            documents=documents,
-            ids=ids,
-            embeddings=embeddings,
-            metadatas=metadatas
+            start = time.perf_counter()
+            self.collection.upsert(
+                ids=ids,
+                documents=documents,
+                embeddings=embeddings,
+                metadatas=metadatas if any(metadatas) else None
+            )
+            stats["write_seconds"] += time.perf_counter() - start
+            stats["upserted"] += len(batch)
+
+        print(
+            f"Indexed {stats['upserted']} documents"
+            f" (skipped {stats['skipped']} existing)"
         )
-        print(f"Indexed {len(documents)} documents")
+        return stats
 
     # ------------------ Remove ------------------
     def remove_documents(self, ids: List[str]):
@@ -95,9 +189,74 @@ class SemanticSearchEngine:
         return formatted
 
 
+# ------------------ Load Benchmark ------------------
+def benchmark_bulk_load(
+    persist_path: str,
+    num_documents: int = 1_000_000,
+    batch_size: int = 5000,
+    embed_sample: int = 2000
+):
+    """Measure a full load into a persistent collection and the restart cost.
+
+    Writing 1M documents is timed with pre-computed random unit vectors so
+    the number reflects Chroma's storage path; model throughput is measured
+    on `embed_sample` documents and extrapolated for the full corpus.
+    """
+    engine = SemanticSearchEngine(
+        "load_benchmark", persist_path=persist_path, batch_size=batch_size
+    )
+    dim = engine.model.get_sentence_embedding_dimension()
+    rng = np.random.default_rng(0)
+
+    def random_unit_vectors(docs):
+        vecs = rng.standard_normal((len(docs), dim), dtype=np.float32)
+        return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+    def records():
+        for i in range(num_documents):
+            yield f"doc-{i}", f"Synthetic document number {i} about topic {i % 997}", {"shard": i % 16}
+
+    start = time.perf_counter()
+    stats = engine.upsert_stream(records(), embeddings_fn=random_unit_vectors)
+    load_seconds = time.perf_counter() - start
+
+    sample = [f"Synthetic document number {i} about topic {i % 997}" for i in range(embed_sample)]
+    start = time.perf_counter()
+    engine.model.encode(sample, batch_size=engine.embedding_batch_size, convert_to_numpy=True)
+    embed_rate = embed_sample / (time.perf_counter() - start)
+
+    # Restart: reopening the persisted collection must not re-index anything
+    start = time.perf_counter()
+    reopened = chromadb.PersistentClient(path=persist_path).get_collection("load_benchmark")
+    count = reopened.count()
+    reopen_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resumed = engine.upsert_stream(records(), skip_existing=True, embeddings_fn=random_unit_vectors)
+    resume_seconds = time.perf_counter() - start
+
+    report = {
+        "documents": num_documents,
+        "batch_size": engine.batch_size,
+        "load_seconds": round(load_seconds, 2),
+        "write_docs_per_sec": round(stats["upserted"] / stats["write_seconds"], 1),
+        "embed_docs_per_sec": round(embed_rate, 1),
+        "estimated_full_embed_seconds": round(num_documents / embed_rate, 1),
+        "reopen_seconds": round(reopen_seconds, 3),
+        "reopened_count": count,
+        "resume_skip_seconds": round(resume_seconds, 2),
+        "resume_skipped": resumed["skipped"]
+    }
+    print("Load benchmark:", report)
+    return report
+
+
 # ------------------ Example Usage ------------------
 if __name__ == "__main__":
-    engine = SemanticSearchEngine(collection_name="my_semantic_docs")
+    engine = SemanticSearchEngine(
+        collection_name="my_semantic_docs",
+        persist_path="./chroma_db"
+    )
 
     # Index documents (dynamic input)
     engine.index_documents(
@@ -126,3 +285,6 @@ if __name__ == "__main__":
         print("Score:", r["similarity_score"])
         print("Text:", r["document"])
         print("Metadata:", r["metadata"])
+
+    # Bulk load benchmark (1M documents, persistent collection)
+    # benchmark_bulk_load("./chroma_benchmark_db")
@@ -0,0 +1,45 @@
+import unittest
+
+from main import CollectionManager
+
+
+class TenantIsolationTest(unittest.TestCase):
+    def setUp(self):
+        self.manager = CollectionManager()
+
+    def add(self, collection, text):
+        collection.upsert(ids=[text], documents=[text], embeddings=[[0.1, 0.2, 0.3]])
+
+    def test_short_tenant_names_are_valid(self):
+        for tenant in ("hr", "t1", "x"):
+            collection = self.manager.collection("short_tenant_docs", tenant)
+            self.add(collection, f"{tenant} policy")
+            self.assertEqual(collection.count(), 1)
+
+    def test_reserved_database_name_is_isolated_from_default(self):
+        self.add(self.manager.collection("reserved_docs"), "shared")
+        spoofed = self.manager.collection("reserved_docs", "default_database")
+        self.assertEqual(spoofed.count(), 0)
+        self.assertNotEqual(
+            CollectionManager.database_name("default_database"),
+            CollectionManager.DEFAULT_DATABASE,
+        )
+
+    def test_same_collection_name_across_tenants(self):
+        self.add(self.manager.collection("same_name_docs", "acme"), "acme only")
+        other = self.manager.collection("same_name_docs", "globex")
+        self.assertEqual(other.count(), 0)
+        self.assertNotEqual(
+            CollectionManager.database_name("acme"),
+            CollectionManager.database_name("globex"),
+        )
+
+    def test_close_keeps_the_data(self):
+        self.add(self.manager.collection("closed_docs", "hr"), "kept")
+        self.assertTrue(self.manager.close("closed_docs", "hr"))
+        self.assertFalse(self.manager.close("closed_docs", "hr"))
+        self.assertEqual(self.manager.collection("closed_docs", "hr").count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,15 +2,223 @@ from openai import OpenAI
 import os, sys
 import chromadb
 from chromadb.config import Settings
+import hashlib
+import threading
+from collections import OrderedDict
+from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+class EmbeddingGenerator:
+    """
+    Batched sentence-transformers embeddings with an in-memory LRU cache.
+
+    One instance per model is shared by every collection in the process
+    (EmbeddingGenerator.shared()), so each text is embedded once, with the
+    model we pick, and Chroma never falls back to its own embedding function.
+    """
+
+    _instances = {}
+
+    def __init__(self, model_name="all-MiniLM-L6-v2", batch_size=64, cache_size=50000):
+        self.model = SentenceTransformer(model_name)
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+
+    @classmethod
+    def shared(cls, model_name="all-MiniLM-L6-v2"):
+        if model_name not in cls._instances:
+            cls._instances[model_name] = cls(model_name)
+        return cls._instances[model_name]
+
+    def embed(self, texts):
+        """Embed a list of texts; only texts not seen before hit the model, in one batch."""
+        missing = [t for t in dict.fromkeys(texts) if t not in self.cache]
+        if missing:
+            vectors = self.model.encode(
+                missing,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            for text, vector in zip(missing, vectors):
+                self.cache[text] = vector.tolist()
+
+        embeddings = []
+        for text in texts:
+            self.cache.move_to_end(text)
+            embeddings.append(self.cache[text])
+
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return embeddings
+
+    def embed_query(self, text):
+        return self.embed([text])[0]
+
+
+class CollectionManager:
+    """
+    Shared Chroma collections for many tenants in one process.
+
+    Clients are pooled per storage path (None = in-memory) and tenant. Each
+    tenant gets its own Chroma database, named from a hash of the tenant so
+    any tenant string is valid and none can alias the default database;
+    tenants never see each other's collections, whatever the names are.
+
+    Collections are opened lazily with get_or_create_collection and at most
+    `max_handles` collection handles are cached, least recently used closed
+    first. Closing a handle only drops the Python object; it does not free
+    index memory. Memory is bounded by storage instead: for persistent
+    paths the clients run with Chroma's LRU segment cache, so idle
+    collections' HNSW indexes are unloaded once `memory_limit_mb` is
+    reached and reloaded from disk on the next use. In-memory clients keep
+    every collection resident until it is deleted.
+    """
+
+    DEFAULT_DATABASE = "default_database"
+
+    _clients = {}
+    _memory_limits = {}
+    _managers = {}
+    _lock = threading.RLock()
+
+    def __init__(self, path=None, max_handles=32, memory_limit_mb=1024):
+        self.path = path
+        self.max_handles = max_handles
+        self.memory_limit_mb = memory_limit_mb
+        self.client = self.get_client(path, memory_limit_mb)
+        self.tenants = set()
+        self.open_collections = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _settings(path, memory_limit_mb):
+        if path is None:
+            return Settings()
+        return Settings(
+            anonymized_telemetry=False,
+            chroma_segment_cache_policy="LRU",
+            chroma_memory_limit_bytes=memory_limit_mb * 1024 * 1024
+        )
+
+    @classmethod
+    def database_name(cls, tenant=None):
+        """Chroma database for a tenant; valid for any tenant string and never the default one."""
+        if not tenant:
+            return cls.DEFAULT_DATABASE
+        return "tenant_" + hashlib.sha1(tenant.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def get_client(cls, path=None, memory_limit_mb=1024, tenant=None):
+        """Pooled client for (path, tenant); the tenant's database is created on first use."""
+        with cls._lock:
+            if path is not None and cls._memory_limits.setdefault(path, memory_limit_mb) != memory_limit_mb:
+                raise ValueError(
+                    f"Chroma at {path} is already open with memory_limit_mb="
+                    f"{cls._memory_limits[path]}, got {memory_limit_mb}"
+                )
+
+            key = (path, tenant)
+            if key not in cls._clients:
+                settings = cls._settings(path, memory_limit_mb)
+                database = cls.database_name(tenant)
+                if tenant:
+                    admin = chromadb.AdminClient(cls.get_client(path, memory_limit_mb).get_settings())
+                    if database not in {db["name"] for db in admin.list_databases()}:
+                        admin.create_database(database)
+
+                if path is None:
+                    client = chromadb.Client(settings, database=database)
+                else:
+                    client = chromadb.PersistentClient(
+                        path=path, settings=settings, database=database
+                    )
+                cls._clients[key] = client
+            return cls._clients[key]
+
+    @classmethod
+    def shared(cls, path=None):
+        with cls._lock:
+            if path not in cls._managers:
+                cls._managers[path] = cls(path)
+            return cls._managers[path]
+
+    def collection(self, name, tenant=None):
+        """Return the tenant's collection, creating it on first use."""
+        key = (tenant, name)
+        with self.lock:
+            if key in self.open_collections:
+                self.open_collections.move_to_end(key)
+                return self.open_collections[key]
+
+            client = self.get_client(self.path, self.memory_limit_mb, tenant)
+            collection = client.get_or_create_collection(
+                name=name, embedding_function=None
+            )
+            if tenant:
+                self.tenants.add(tenant)
+            self.open_collections[key] = collection
+            while len(self.open_collections) > self.max_handles:
+                self.open_collections.popitem(last=False)
+            return collection
+
+    def close(self, name, tenant=None):
+        """Drop the cached handle; the collection and its data stay in Chroma."""
+        with self.lock:
+            return self.open_collections.pop((tenant, name), None) is not None
+
+    def stats(self):
+        """Per-collection document count, dimension and estimated index memory."""
+        open_keys = set(self.open_collections)
+        report = []
+        for tenant in [None] + sorted(self.tenants):
+            client = self.get_client(self.path, self.memory_limit_mb, tenant)
+            for collection in client.list_collections():
+                count = collection.count()
+                dimension = 0
+                if count:
+                    sample = collection.get(limit=1, include=["embeddings"])
+                    dimension = len(sample["embeddings"][0])
+
+                # float32 vector + level-0 HNSW links + label per element
+                neighbors = (collection.configuration.get("hnsw") or {}).get("max_neighbors", 16)
+                index_bytes = count * (dimension * 4 + neighbors * 2 * 4 + 8)
+
+                report.append({
+                    "tenant": tenant,
+                    "collection": collection.name,
+                    "documents": count,
+                    "dimension": dimension,
+                    "estimated_memory_mb": round(index_bytes / (1024 * 1024), 2),
+                    "open": (tenant, collection.name) in open_keys
+                })
+        return report
+
+
+def content_ids(texts):
+    """
+    Deterministic IDs from text content: re-adding the same texts is
+    idempotent, and new texts never overwrite earlier ones. Repeats of a
+    text within one call get an occurrence suffix so IDs stay unique.
+    """
+    seen = {}
+    ids = []
+    for text in texts:
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        seen[digest] = seen.get(digest, -1) + 1
+        ids.append(f"{digest}-{seen[digest]}")
+    return ids
+
+
 class RefinedRAGWithMerge:
-    def __init__(self):
-        self.client = chromadb.Client(Settings())
+    def __init__(self, embedder=None, manager=None):
+        self.manager = manager or CollectionManager.shared()
         self.collection = None
+        self.embedder = embedder or EmbeddingGenerator.shared()
 
         # Read API key
         self.api_key = os.getenv("OPENROUTER_API_KEY")
@@ -23,20 +231,26 @@ class RefinedRAGWithMerge:
             api_key=self.api_key,
         )
 
-    def setup(self, collection_name="rag_refined_merge"):
-        """Initialize ChromaDB collection"""
-        self.collection = self.client.create_collection(name=collection_name)
+    def setup(self, collection_name="rag_refined_merge", tenant=None):
+        """Open (or create) the collection, optionally namespaced by tenant"""
+        self.collection = self.manager.collection(collection_name, tenant)
 
     def add_documents(self, texts, ids=None, metadatas=None):
         """Add documents with metadata"""
         if ids is None:
-            ids = [f"doc_{i}" for i in range(len(texts))]
-        self.collection.add(documents=texts, ids=ids, metadatas=metadatas)
+            ids = content_ids(texts)
+        # upsert keeps re-runs against an existing collection idempotent
+        self.collection.upsert(
+            documents=texts,
+            ids=ids,
+            metadatas=metadatas,
+            embeddings=self.embedder.embed(texts)
+        )
     
     def retrieve_with_threshold(self,query,k, threshold=0.7):
         """Retrieve only chunks above similarity threshold"""
         results = self.collection.query(
-                query_texts=[query],
+                query_embeddings=[self.embedder.embed_query(query)],
                 n_results=k
             )
             
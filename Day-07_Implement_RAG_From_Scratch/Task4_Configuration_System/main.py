@@ -1,8 +1,19 @@
 import os
 import sys
+import re
 import json
+import time
+import zlib
+import codecs
+import hashlib
+import itertools
+import queue
+import asyncio
+import tempfile
+import threading
 import numpy as np
-from typing import List, Dict
+from concurrent.futures import Future
+from typing import List, Dict, Iterable, Iterator
 from openai import OpenAI
 from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
@@ -23,6 +34,62 @@ client = OpenAI(
     api_key=api_key
 )
 
+# ===============================
+# 🧩 EMBEDDING BACKENDS
+# ===============================
+# "embedding_model" selects the backend with an optional prefix:
+#   "all-MiniLM-L6-v2"           → PyTorch SentenceTransformer
+#   "onnx:all-MiniLM-L6-v2"      → exported ONNX graph (onnxruntime)
+#   "onnx-int8:all-MiniLM-L6-v2" → ONNX graph with dynamic int8 quantization
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+ONNX_CACHE_DIR = "onnx_models"
+ONNX_QUANT_CONFIG = "avx2"
+
+
+def parse_embedding_model(spec: str):
+    backend, sep, name = spec.partition(":")
+    if not sep:
+        return "torch", spec
+    return backend, name
+
+
+def load_embedding_model(spec: str) -> SentenceTransformer:
+    backend, name = parse_embedding_model(spec)
+
+    if backend == "torch":
+        return SentenceTransformer(name)
+
+    if backend == "onnx":
+        return SentenceTransformer(name, backend="onnx")
+
+    if backend == "onnx-int8":
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        local_dir = os.path.join(ONNX_CACHE_DIR, name.replace("/", "__"))
+        file_name = f"onnx/model_qint8_{ONNX_QUANT_CONFIG}.onnx"
+
+        if not os.path.exists(os.path.join(local_dir, file_name)):
+            print(f"[EmbeddingBackend] Exporting int8 ONNX model → {local_dir}")
+            model = SentenceTransformer(name, backend="onnx")
+            model.save(local_dir)
+            export_dynamic_quantized_onnx_model(
+                model, ONNX_QUANT_CONFIG, local_dir
+            )
+
+        return SentenceTransformer(
+            local_dir, backend="onnx", model_kwargs={"file_name": file_name}
+        )
+
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+# ===============================
+# ✂️ CHUNKING MODES
+# ===============================
+# "fixed"    → overlapping word windows (chunk_size / overlap)
+# "semantic" → sentence groups split where the topic shifts
+CHUNKING_MODES = ("fixed", "semantic")
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
 # ===============================
 # ⚙️ CONFIG CLASS
 # ===============================
@@ -30,9 +97,38 @@ class Config:
     DEFAULTS = {
         "chunk_size": 500,
         "overlap": 50,
+        "chunking_mode": "fixed",
+        "semantic_chunking": {
+            "window": 2,
+            "breakpoint_percentile": 90,
+            "min_tokens": 64,
+            "max_tokens": 256
+        },
         "top_k": 3,
         "similarity_threshold": 0.0,
+        "pdf_cache_dir": ".pdf_cache",
         "embedding_model": "all-MiniLM-L6-v2",
+        "embedding_batch_size": 32,
+        "embedding_server": {
+            "enabled": False,
+            "max_batch_size": 32,
+            "max_wait_ms": 5.0
+        },
+        "dedup": {
+            "enabled": False,
+            "num_perm": 128,
+            "bands": 16,
+            "threshold": 0.8,
+            "shingle_size": 3,
+            "embedding_threshold": None
+        },
+        "reduction": {
+            "enabled": False,
+            "dim": 128,
+            "candidates": 50,
+            "full_vectors_path": ".vector_cache/vectors_full.f32",
+            "refit_growth": 2.0
+        },
         "llm": {
             "model": "openai/gpt-oss-20b:free",
             "temperature": 0.0,
@@ -65,6 +161,12 @@ class Config:
                 base[k] = v
 
     def _validate(self):
+        backend, _ = parse_embedding_model(self.data["embedding_model"])
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(
+                f"embedding backend must be one of {EMBEDDING_BACKENDS}"
+            )
+
         if self.data["chunk_size"] <= 0:
             raise ValueError("chunk_size must be > 0")
 
@@ -74,6 +176,26 @@ class Config:
         if self.data["overlap"] >= self.data["chunk_size"]:
             raise ValueError("overlap must be smaller than chunk_size")
 
+        if self.data["chunking_mode"] not in CHUNKING_MODES:
+            raise ValueError(f"chunking_mode must be one of {CHUNKING_MODES}")
+
+        semantic = self.data["semantic_chunking"]
+        if semantic["window"] <= 0:
+            raise ValueError("semantic_chunking.window must be > 0")
+
+        if not (0 < semantic["breakpoint_percentile"] < 100):
+            raise ValueError(
+                "semantic_chunking.breakpoint_percentile must be between 0 and 100"
+            )
+
+        if semantic["min_tokens"] <= 0:
+            raise ValueError("semantic_chunking.min_tokens must be > 0")
+
+        if semantic["max_tokens"] < semantic["min_tokens"]:
+            raise ValueError(
+                "semantic_chunking.max_tokens must be >= min_tokens"
+            )
+
         if self.data["top_k"] <= 0:
             raise ValueError("top_k must be > 0")
 
@@ -83,10 +205,298 @@ class Config:
         if self.data["llm"]["max_tokens"] <= 0:
             raise ValueError("max_tokens must be > 0")
 
+        if self.data["embedding_batch_size"] <= 0:
+            raise ValueError("embedding_batch_size must be > 0")
+
+        if self.data["embedding_server"]["max_batch_size"] <= 0:
+            raise ValueError("embedding_server.max_batch_size must be > 0")
+
+        if self.data["embedding_server"]["max_wait_ms"] < 0:
+            raise ValueError("embedding_server.max_wait_ms cannot be negative")
+
+        dedup = self.data["dedup"]
+        if dedup["num_perm"] <= 0 or dedup["bands"] <= 0:
+            raise ValueError("dedup.num_perm and dedup.bands must be > 0")
+
+        if dedup["num_perm"] % dedup["bands"] != 0:
+            raise ValueError("dedup.num_perm must be divisible by dedup.bands")
+
+        if not (0.0 < dedup["threshold"] <= 1.0):
+            raise ValueError("dedup.threshold must be between 0 and 1")
+
+        if self.data["reduction"]["dim"] <= 0:
+            raise ValueError("reduction.dim must be > 0")
+
+        if self.data["reduction"]["candidates"] < self.data["top_k"]:
+            raise ValueError("reduction.candidates must be >= top_k")
+
+        if self.data["reduction"]["refit_growth"] < 1.0:
+            raise ValueError("reduction.refit_growth must be >= 1.0")
+
+# ===============================
+# 🌐 HTML EXTRACTION
+# ===============================
+HTML_READ_SIZE = 1 << 16
+HTML_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+HTML_BLOCKS = {"p", "li", "pre", "blockquote", "dt", "dd", "figcaption"}
+HTML_CONTAINERS = {"div", "section", "article", "main", "body"}
+HTML_SKIP = {"script", "style", "noscript", "template", "nav", "header",
+             "footer", "aside", "form", "svg"}
+HTML_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.I)
+HTTP_CHARSET = re.compile(r"""charset\s*=\s*["']?([\w.:-]+)""", re.I)
+HTML_BOMS = ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16"),
+             (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+def sniff_html_encoding(head: bytes, declared: str = None) -> str:
+    """Charset of an HTML byte stream, in HTML-spec order: BOM, the
+    transport-declared charset (HTTP Content-Type), a <meta> charset in the
+    first 4 KB, else UTF-8 (lxml would otherwise fall back to Latin-1)."""
+    for bom, name in HTML_BOMS:
+        if head.startswith(bom):
+            return name
+
+    candidates = [declared] if declared else []
+    match = HTML_META_CHARSET.search(head[:4096])
+    if match:
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+
+    for name in candidates:
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+def _element_text(elem) -> str:
+    return " ".join("".join(elem.itertext()).split())
+
+
+def _release(elem):
+    """Free a handled element (keeping its tail) and its handled siblings."""
+    tail = elem.tail
+    elem.clear()
+    elem.tail = tail
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            prev = elem.getprevious()
+            if prev.tail and prev.tail.strip():
+                break  # the parent still needs that text
+            parent.remove(prev)
+
+
+def _table_text(table) -> str:
+    headers, lines = [], []
+    for tr in table.iter("tr"):
+        cells = [c for c in tr if c.tag in ("th", "td")]
+        values = [_element_text(c) for c in cells]
+        if cells and all(c.tag == "th" for c in cells) and not headers:
+            headers = values
+        elif any(values):
+            if headers and len(headers) == len(values):
+                lines.append(" | ".join(f"{h}: {v}" for h, v in zip(headers, values)))
+            else:
+                lines.append(" | ".join(values))
+    return "\n".join(lines)
+
+
+def iter_html_sections(chunks: Iterable[bytes],
+                       encoding: str = None) -> Iterator[Dict]:
+    """Incrementally parse HTML bytes into sections with their heading path.
+
+    `encoding` is the transport-declared charset, if any; the parser's
+    charset is resolved from it and the first 4 KB by sniff_html_encoding.
+    Bytes are fed to lxml's pull parser as they arrive; each paragraph,
+    table or heading is handled on its end event and then released, so
+    memory stays bounded on large pages. Boilerplate (nav, header, footer,
+    aside, scripts) is skipped. Yields {"section_path", "type", "text"}
+    with type "text" or "table".
+    """
+    from lxml import etree
+
+    # Buffer enough of the stream to see a BOM or <meta charset> first
+    chunks = iter(chunks)
+    head = b""
+    for data in chunks:
+        head += data
+        if len(head) >= 4096:
+            break
+    parser = etree.HTMLPullParser(
+        events=("start", "end"), encoding=sniff_html_encoding(head, encoding)
+    )
+    headings = []   # [(level, title)]
+    buffer = []     # text blocks of the current section
+    skip_depth = 0
+    table_depth = 0
+
+    def path() -> str:
+        return " > ".join(title for _, title in headings)
+
+    def flush():
+        if buffer:
+            section = {"section_path": path(), "type": "text", "text": "\n".join(buffer)}
+            buffer.clear()
+            return [section]
+        return []
+
+    def handle(events):
+        nonlocal skip_depth, table_depth
+        for event, elem in events:
+            tag = elem.tag if isinstance(elem.tag, str) else ""
+
+            if event == "start":
+                if tag in HTML_SKIP:
+                    skip_depth += 1
+                elif tag == "table":
+                    table_depth += 1
+                continue
+
+            if tag in HTML_SKIP:
+                skip_depth -= 1
+                _release(elem)
+                continue
+            if skip_depth:
+                continue
+
+            if tag == "table":
+                table_depth -= 1
+                if table_depth == 0:
+                    yield from flush()
+                    text = _table_text(elem)
+                    if text:
+                        yield {"section_path": path(), "type": "table", "text": text}
+                    _release(elem)
+            elif table_depth:
+                continue
+            elif tag in HTML_HEADINGS:
+                yield from flush()
+                level = HTML_HEADINGS[tag]
+                while headings and headings[-1][0] >= level:
+                    headings.pop()
+                title = _element_text(elem)
+                if title:
+                    headings.append((level, title))
+                _release(elem)
+            elif tag in HTML_BLOCKS or tag in HTML_CONTAINERS:
+                text = _element_text(elem)
+                if text:
+                    buffer.append(text)
+                _release(elem)
+
+    for data in itertools.chain([head], chunks):
+        if not data:
+            continue
+        parser.feed(data)
+        yield from handle(parser.read_events())
+    parser.close()
+    yield from handle(parser.read_events())
+    yield from flush()
+
+
+# ===============================
+# 💾 PDF EXTRACTION CACHE
+# ===============================
+class CachedPages:
+    """Read-only view of cached page texts; any page can be read on its own."""
+
+    def __init__(self, data_path: str, offsets: List[List[int]]):
+        self.data_path = data_path
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, page_index: int) -> str:
+        start, end = self.offsets[page_index]
+        with open(self.data_path, "rb") as f:
+            f.seek(start)
+            return zlib.decompress(f.read(end - start)).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        with open(self.data_path, "rb") as f:
+            for start, end in self.offsets:
+                f.seek(start)
+                yield zlib.decompress(f.read(end - start)).decode("utf-8")
+
+
+class PdfTextCache:
+    """Extracted page text on disk, keyed by content hash + pypdf version.
+
+    A size+mtime index avoids re-hashing unchanged files; pages are
+    zlib-compressed one by one so they stay randomly addressable.
+    """
+
+    def __init__(self, cache_dir: str, extractor_version: str):
+        self.cache_dir = cache_dir
+        self.extractor_version = extractor_version
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.index_path = os.path.join(cache_dir, "fingerprints.json")
+        self._fingerprints = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._fingerprints = json.load(f)
+
+    def _key(self, filepath: str) -> str:
+        stat = os.stat(filepath)
+        fast_key = f"{os.path.abspath(filepath)}|{stat.st_size}|{stat.st_mtime_ns}"
+        digest = self._fingerprints.get(fast_key)
+
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(filepath, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(block)
+            digest = sha.hexdigest()
+
+            self._fingerprints[fast_key] = digest
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump(self._fingerprints, f)
+
+        return f"{digest[:32]}-pypdf{self.extractor_version}"
+
+    def get(self, filepath: str):
+        key = self._key(filepath)
+        meta_path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return CachedPages(
+            os.path.join(self.cache_dir, f"{key}.bin"), meta["offsets"]
+        )
+
+    def put(self, filepath: str, pages: List[str]) -> CachedPages:
+        key = self._key(filepath)
+        data_path = os.path.join(self.cache_dir, f"{key}.bin")
+        offsets = []
+        pos = 0
+
+        with open(data_path + ".tmp", "wb") as f:
+            for text in pages:
+                blob = zlib.compress(text.encode("utf-8"), 6)
+                f.write(blob)
+                offsets.append([pos, pos + len(blob)])
+                pos += len(blob)
+        os.replace(data_path + ".tmp", data_path)
+
+        # Written last, so an interrupted put never looks like a cache hit
+        meta_path = os.path.join(self.cache_dir, f"{key}.json")
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.basename(filepath), "offsets": offsets}, f)
+
+        return CachedPages(data_path, offsets)
+
 # ===============================
 # 📄 DOCUMENT LOADER
 # ===============================
 class DocumentLoader:
+    def __init__(self, cache_dir: str = None):
+        self.cache_dir = cache_dir
+
     def load_text_file(self, filepath: str) -> str:
         try:
             print(f"[DocumentLoader] Loading TXT: {filepath}")
@@ -100,21 +510,64 @@ class DocumentLoader:
         try:
             print(f"[DocumentLoader] Loading PDF: {filepath}")
             import pypdf
-            text = ""
 
+            cache = None
+            if self.cache_dir:
+                cache = PdfTextCache(self.cache_dir, pypdf.__version__)
+                pages = cache.get(filepath)
+                if pages is not None:
+                    print(f"[DocumentLoader] Cache hit: {len(pages)} pages")
+                    return "".join(t + "\n" for t in pages if t)
+
+            pages = []
             with open(filepath, "rb") as f:
                 reader = pypdf.PdfReader(f)
                 for i, page in enumerate(reader.pages):
-                    page_text = page.extract_text()
+                    page_text = page.extract_text() or ""
                     if page_text:
                         print(f"[PDF] Extracted page {i + 1}")
-                        text += page_text + "\n"
+                    pages.append(page_text)
+
+            if cache:
+                cache.put(filepath, pages)
 
-            return text
+            return "".join(t + "\n" for t in pages if t)
         except Exception as e:
             print(f"[ERROR][PDF] {e}")
             return ""
 
+    def load_html(self, source: str) -> List[Dict]:
+        """Load a local .html file or an http(s) URL as heading-scoped sections."""
+        try:
+            print(f"[DocumentLoader] Loading HTML: {source}")
+            if source.startswith(("http://", "https://")):
+                import requests
+
+                with requests.get(source, stream=True, timeout=(5, 30)) as resp:
+                    resp.raise_for_status()
+                    # Only an explicit charset counts; requests' resp.encoding
+                    # falls back to ISO-8859-1 for any text/* response
+                    declared = HTTP_CHARSET.search(resp.headers.get("Content-Type", ""))
+                    sections = list(iter_html_sections(
+                        resp.iter_content(HTML_READ_SIZE),
+                        encoding=declared.group(1) if declared else None
+                    ))
+            else:
+                with open(source, "rb") as f:
+                    sections = list(iter_html_sections(
+                        iter(lambda: f.read(HTML_READ_SIZE), b"")
+                    ))
+
+            tables = sum(s["type"] == "table" for s in sections)
+            print(
+                f"[DocumentLoader] Extracted {len(sections)} sections"
+                f" ({tables} tables)"
+            )
+            return sections
+        except Exception as e:
+            print(f"[ERROR][HTML] {e}")
+            return []
+
 # ===============================
 # ✂️ TEXT CHUNKER
 # ===============================
@@ -143,6 +596,257 @@ class TextChunker:
         print(f"[Chunker] Total chunks: {len(chunks)}\n")
         return chunks
 
+# ===============================
+# 🧭 SEMANTIC CHUNKER
+# ===============================
+class SemanticChunker:
+    """Split text where the topic shifts instead of every N words.
+
+    Sentences are embedded once, in batches. For every gap between two
+    sentences the mean embedding of the `window` sentences before it is
+    compared with the mean of the `window` sentences after it; gaps whose
+    cosine distance is a local peak in the top (100 - breakpoint_percentile)%
+    become breakpoints. Chunks close at a breakpoint once they hold min_tokens
+    and are always closed before they would exceed max_tokens.
+
+    Each chunk carries an "embedding": the token-weighted mean of its
+    sentence embeddings, so chunk text never goes through the model again.
+    """
+
+    def __init__(self, config: Config, embedder: "EmbeddingGenerator"):
+        cfg = config.data["semantic_chunking"]
+        self.window = cfg["window"]
+        self.breakpoint_percentile = cfg["breakpoint_percentile"]
+        self.min_tokens = cfg["min_tokens"]
+        self.max_tokens = cfg["max_tokens"]
+        self.embedder = embedder
+
+    @staticmethod
+    def split_sentences(text: str) -> List[str]:
+        text = text.replace("\n", " ").strip()
+        return [s for s in SENTENCE_BOUNDARY.split(text) if s.strip()]
+
+    def _token_counts(self, sentences: List[str]) -> np.ndarray:
+        tokenizer = self.embedder.model.tokenizer
+        ids = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+        return np.array([len(x) for x in ids])
+
+    def _gap_distances(self, embs: np.ndarray) -> np.ndarray:
+        """Cosine distance across each of the len(embs) - 1 sentence gaps."""
+        n, w = len(embs), self.window
+        csum = np.vstack([np.zeros((1, embs.shape[1])), np.cumsum(embs, axis=0)])
+
+        gaps = np.arange(1, n)  # gap g sits between sentence g-1 and g
+        lo = np.maximum(gaps - w, 0)
+        hi = np.minimum(gaps + w, n)
+        left = csum[gaps] - csum[lo]
+        right = csum[hi] - csum[gaps]
+
+        left /= np.linalg.norm(left, axis=1, keepdims=True) + 1e-12
+        right /= np.linalg.norm(right, axis=1, keepdims=True) + 1e-12
+        return 1.0 - np.einsum("ij,ij->i", left, right)
+
+    def chunk_text(self, text: str, source: str) -> List[Dict]:
+        print("\n[SemanticChunker] Starting chunking")
+        sentences = self.split_sentences(text)
+        if not sentences:
+            return []
+
+        embs = np.asarray(self.embedder.generate_batch(sentences), dtype=np.float32)
+        tokens = self._token_counts(sentences)
+
+        breaks = set()
+        if len(sentences) > 1:
+            dist = self._gap_distances(embs)
+            cutoff = np.percentile(dist, self.breakpoint_percentile)
+            # The window smears one shift over neighbouring gaps: keep only
+            # local peaks, and never treat a zero-distance gap as a shift
+            padded = np.pad(dist, 1, constant_values=-np.inf)
+            peaks = (dist >= padded[:-2]) & (dist >= padded[2:])
+            shifts = peaks & (dist >= cutoff) & (dist > 1e-6)
+            breaks = {int(g) + 1 for g in np.nonzero(shifts)[0]}
+
+        chunks = []
+
+        def emit(start: int, end: int):
+            weights = tokens[start:end, None].astype(np.float32)
+            pooled = (embs[start:end] * weights).sum(axis=0) / weights.sum()
+            pooled /= np.linalg.norm(pooled) + 1e-12
+            chunk_text = " ".join(sentences[start:end])
+            chunks.append({
+                "text": chunk_text,
+                "source": source,
+                "chunk_id": len(chunks) + 1,
+                "word_count": len(chunk_text.split()),
+                "token_count": int(tokens[start:end].sum()),
+                "embedding": pooled.tolist()
+            })
+            print(
+                f"[SemanticChunker] Chunk {len(chunks)} | sentences: {end - start}"
+                f" | tokens: {chunks[-1]['token_count']}"
+            )
+
+        start, size = 0, 0
+        for i, count in enumerate(tokens):
+            if i > start and (
+                size + count > self.max_tokens
+                or (i in breaks and size >= self.min_tokens)
+            ):
+                emit(start, i)
+                start, size = i, 0
+            size += count
+        emit(start, len(sentences))
+
+        print(
+            f"[SemanticChunker] Total chunks: {len(chunks)}"
+            f" from {len(sentences)} sentences\n"
+        )
+        return chunks
+
+# ===============================
+# 🧹 CHUNK DEDUPLICATOR
+# ===============================
+class ChunkDeduplicator:
+    """Drop near-identical chunks before they are embedded and stored.
+
+    Each chunk gets a MinHash signature over its word shingles; LSH
+    banding finds candidate matches among the chunks kept so far (across
+    documents too), and candidates whose estimated Jaccard similarity
+    reaches the threshold are linked to that canonical chunk instead of
+    being indexed. An optional second pass does the same in embedding
+    space with a cosine threshold.
+    """
+
+    PRIME = (1 << 32) + 15  # smallest prime above 2^32
+
+    def __init__(self, num_perm: int = 128, bands: int = 16,
+                 threshold: float = 0.8, shingle_size: int = 3,
+                 embedding_threshold: float = None, seed: int = 42):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.embedding_threshold = embedding_threshold
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = []
+        self.canonical = []
+        self.duplicates = []
+
+        # Kept embeddings live in a preallocated buffer that doubles when
+        # full; only the first _emb_rows rows are valid
+        self._emb_buffer = None
+        self._emb_rows = 0
+        self._emb_chunks = []
+
+    @staticmethod
+    def _key(chunk: Dict) -> str:
+        return f"{chunk['source']}#{chunk['chunk_id']}"
+
+    def _shingles(self, text: str) -> np.ndarray:
+        words = text.lower().split()
+        n = self.shingle_size
+        grams = {" ".join(words[i:i + n])
+                 for i in range(max(1, len(words) - n + 1))}
+        return np.fromiter(
+            (zlib.crc32(g.encode("utf-8")) for g in grams),
+            dtype=np.uint64, count=len(grams)
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        h = self._shingles(text)
+        return ((np.outer(h, self.a) + self.b) % self.PRIME).min(axis=0)
+
+    def _band_keys(self, sig: np.ndarray):
+        for band in range(len(self.buckets)):
+            yield band, sig[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _find_match(self, sig: np.ndarray):
+        candidates = set()
+        for band, key in self._band_keys(sig):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        best, best_sim = None, self.threshold
+        for idx in candidates:
+            sim = float(np.mean(self.signatures[idx] == sig))
+            if sim >= best_sim:
+                best, best_sim = idx, sim
+        return best, best_sim
+
+    def _link(self, dup: Dict, canonical: Dict, similarity: float):
+        dup["duplicate_of"] = self._key(canonical)
+        dup["duplicate_similarity"] = round(similarity, 4)
+        canonical.setdefault("duplicates", []).append(self._key(dup))
+        self.duplicates.append(dup)
+
+    def dedupe(self, chunks: List[Dict]) -> List[Dict]:
+        unique = []
+        for chunk in chunks:
+            sig = self.signature(chunk["text"])
+            match, sim = self._find_match(sig)
+
+            if match is not None:
+                self._link(chunk, self.canonical[match], sim)
+                continue
+
+            idx = len(self.signatures)
+            for band, key in self._band_keys(sig):
+                self.buckets[band].setdefault(key, []).append(idx)
+            self.signatures.append(sig)
+            self.canonical.append(chunk)
+            unique.append(chunk)
+
+        print(
+            f"[Dedup] MinHash: kept {len(unique)}/{len(chunks)} chunks"
+            f" | {len(chunks) - len(unique)} near-duplicates linked"
+        )
+        return unique
+
+    def _reserve(self, rows: int, dim: int):
+        if self._emb_buffer is None:
+            self._emb_buffer = np.empty((max(rows, 64), dim), dtype=np.float32)
+        elif rows > len(self._emb_buffer):
+            grown = np.empty((max(rows, 2 * len(self._emb_buffer)), dim),
+                             dtype=np.float32)
+            grown[:self._emb_rows] = self._emb_buffer[:self._emb_rows]
+            self._emb_buffer = grown
+
+    def dedupe_embeddings(self, embeddings: List[List[float]],
+                          chunks: List[Dict]):
+        """Cosine near-duplicate pass; returns (embeddings, chunks) to keep."""
+        if self.embedding_threshold is None or not embeddings:
+            return embeddings, chunks
+
+        vecs = np.asarray(embeddings, dtype=np.float32)
+        vecs /= np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+        self._reserve(self._emb_rows + len(vecs), vecs.shape[1])
+
+        kept_embs, kept_chunks = [], []
+        for emb, vec, chunk in zip(embeddings, vecs, chunks):
+            if self._emb_rows:
+                sims = self._emb_buffer[:self._emb_rows] @ vec
+                best = int(np.argmax(sims))
+                if sims[best] >= self.embedding_threshold:
+                    self._link(chunk, self._emb_chunks[best], float(sims[best]))
+                    continue
+
+            self._emb_buffer[self._emb_rows] = vec
+            self._emb_rows += 1
+            self._emb_chunks.append(chunk)
+            kept_embs.append(emb)
+            kept_chunks.append(chunk)
+
+        print(
+            f"[Dedup] Embedding: kept {len(kept_chunks)}/{len(chunks)} chunks"
+        )
+        return kept_embs, kept_chunks
+
 # ===============================
 # 🧠 EMBEDDING GENERATOR
 # ===============================
@@ -150,21 +854,281 @@ class EmbeddingGenerator:
     def __init__(self, config: Config):
         model_name = config.data["embedding_model"]
         print(f"[EmbeddingGenerator] Loading model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        self.model = load_embedding_model(model_name)
+        self.batch_size = config.data["embedding_batch_size"]
+        self.last_throughput = {}
+
+    @staticmethod
+    def _clean(text: str) -> str:
+        return text.replace("\n", " ").strip()
 
     def generate(self, text: str) -> List[float]:
         emb = self.model.encode(
-            text.replace("\n", " ").strip(),
+            self._clean(text),
             convert_to_numpy=True
         )
         return emb.tolist()
 
-    def generate_batch(self, texts: List[str]) -> List[List[float]]:
-        embs = self.model.encode(
-            [t.replace("\n", " ").strip() for t in texts],
-            convert_to_numpy=True
+    def _encode_bucketed(self, texts: List[str]) -> List[List[float]]:
+        # Sort by length so each batch pads to a similar size,
+        # then write results back into the original positions
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        out = [None] * len(texts)
+
+        for start in range(0, len(order), self.batch_size):
+            idx = order[start:start + self.batch_size]
+            embs = self.model.encode(
+                [texts[i] for i in idx],
+                batch_size=len(idx),
+                convert_to_numpy=True
+            )
+            for i, emb in zip(idx, embs):
+                out[i] = emb.tolist()
+
+        return out
+
+    def _report(self, count: int, elapsed: float, verbose: bool = True):
+        rate = count / elapsed if elapsed > 0 else 0.0
+        self.last_throughput = {
+            "chunks": count,
+            "seconds": round(elapsed, 4),
+            "chunks_per_sec": round(rate, 2)
+        }
+        if not verbose:
+            return
+        print(
+            f"[EmbeddingGenerator] Embedded {count} chunks in {elapsed:.2f}s"
+            f" | {rate:.1f} chunks/sec"
         )
-        return embs.tolist()
+
+    def generate_batch(self, texts: List[str],
+                       verbose: bool = True) -> List[List[float]]:
+        if not texts:
+            return []
+
+        start = time.perf_counter()
+        embs = self._encode_bucketed([self._clean(t) for t in texts])
+        self._report(len(embs), time.perf_counter() - start, verbose)
+        return embs
+
+    def generate_batch_stream(
+        self, texts: Iterable[str], window_batches: int = 8
+    ) -> Iterator[List[List[float]]]:
+        """Yield embeddings batch by batch, in input order.
+
+        Only window_batches * batch_size texts are held at a time, so
+        arbitrarily large corpora can be embedded with bounded memory.
+        Length bucketing happens within each window.
+        """
+        if window_batches <= 0:
+            raise ValueError("window_batches must be > 0")
+
+        window_size = self.batch_size * window_batches
+        window = []
+        total = 0
+        start = time.perf_counter()
+
+        def flush():
+            embs = self._encode_bucketed(window)
+            for i in range(0, len(embs), self.batch_size):
+                yield embs[i:i + self.batch_size]
+
+        for text in texts:
+            window.append(self._clean(text))
+            if len(window) == window_size:
+                yield from flush()
+                total += len(window)
+                window = []
+
+        if window:
+            yield from flush()
+            total += len(window)
+
+        self._report(total, time.perf_counter() - start)
+
+# ===============================
+# 🧪 BACKEND PARITY & BENCHMARK
+# ===============================
+def check_backend_parity(spec: str, texts: List[str],
+                         min_cosine: float = 0.99) -> Dict:
+    """Compare a backend's embeddings against the PyTorch reference."""
+    _, name = parse_embedding_model(spec)
+    reference = SentenceTransformer(name).encode(texts, convert_to_numpy=True)
+    candidate = load_embedding_model(spec).encode(texts, convert_to_numpy=True)
+
+    cosines = np.sum(reference * candidate, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+    result = {
+        "backend": spec,
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "passed": bool(cosines.min() >= min_cosine)
+    }
+    status = "PASS" if result["passed"] else "FAIL"
+    print(
+        f"[Parity] {spec} | min cosine: {result['min_cosine']:.4f}"
+        f" | mean: {result['mean_cosine']:.4f} | {status}"
+    )
+    return result
+
+
+def benchmark_backends(model_name: str, texts: List[str],
+                       backends=EMBEDDING_BACKENDS, repeats: int = 3) -> List[Dict]:
+    """Measure load time, encode latency and RSS growth per backend."""
+    import gc
+    import psutil
+
+    process = psutil.Process()
+    results = []
+
+    for backend in backends:
+        spec = model_name if backend == "torch" else f"{backend}:{model_name}"
+        gc.collect()
+        rss_before = process.memory_info().rss
+
+        start = time.perf_counter()
+        model = load_embedding_model(spec)
+        load_s = time.perf_counter() - start
+
+        model.encode(texts[:1], convert_to_numpy=True)  # warm-up
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model.encode(texts, convert_to_numpy=True)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        results.append({
+            "backend": backend,
+            "load_s": round(load_s, 3),
+            "encode_s": round(best, 4),
+            "ms_per_text": round(best * 1000 / len(texts), 3),
+            "rss_delta_mb": round(
+                (process.memory_info().rss - rss_before) / 1024 ** 2, 1
+            )
+        })
+        print(f"[Benchmark] {results[-1]}")
+
+        del model
+
+    return results
+
+# ===============================
+# 🚦 EMBEDDING BATCH SERVER
+# ===============================
+class EmbeddingBatchServer:
+    """Collect concurrent single-text requests into micro-batches.
+
+    Callers get a Future back; a background worker waits up to
+    max_wait_ms for more requests (or until max_batch_size is reached)
+    and runs one encode call for the whole batch. Per-batch throughput
+    lines are only printed with verbose=True.
+    """
+
+    _STOP = object()
+
+    def __init__(self, embedder: EmbeddingGenerator,
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0,
+                 verbose: bool = False):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be > 0")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms cannot be negative")
+
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.verbose = verbose
+        self.batches_run = 0
+        self.texts_embedded = 0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="embedding-batch-server", daemon=True
+        )
+        self._worker.start()
+        print(
+            f"[EmbeddingBatchServer] Started | max_batch_size: {max_batch_size}"
+            f" | max_wait_ms: {max_wait_ms}"
+        )
+
+    def submit(self, text: str) -> Future:
+        if self._closed:
+            raise RuntimeError("EmbeddingBatchServer is closed")
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str, timeout: float = None) -> List[float]:
+        return self.submit(text).result(timeout)
+
+    async def embed_async(self, text: str) -> List[float]:
+        return await asyncio.wrap_future(self.submit(text))
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._worker.join()
+        print(
+            f"[EmbeddingBatchServer] Stopped | batches: {self.batches_run}"
+            f" | texts: {self.texts_embedded}"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._process(batch)
+
+    def _process(self, batch):
+        # Skip requests whose caller already cancelled the future
+        batch = [(t, f) for t, f in batch if f.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            embs = self.embedder.generate_batch(
+                [t for t, _ in batch], verbose=self.verbose
+            )
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), emb in zip(batch, embs):
+            future.set_result(emb)
+
+        self.batches_run += 1
+        self.texts_embedded += len(batch)
 
 # ===============================
 # 📦 VECTOR STORE
@@ -205,6 +1169,172 @@ class VectorStore:
             "similarity": float(score)
         } for i, score in scores]
 
+# ===============================
+# 🗜️ PROJECTED VECTOR STORE
+# ===============================
+class ProjectedVectorStore(VectorStore):
+    """Search on PCA-reduced vectors, re-rank with full vectors from disk.
+
+    Full vectors are appended to a raw float32 file at full_vectors_path
+    and memory-mapped, so only the reduced matrix stays resident. The
+    projection is fitted on the first search and refitted only once the
+    corpus has grown by refit_growth×; in between, added vectors are
+    projected with the existing fit and appended.
+    """
+
+    def __init__(self, similarity_threshold: float, dim: int = 128,
+                 candidates: int = 50,
+                 full_vectors_path: str = ".vector_cache/vectors_full.f32",
+                 refit_growth: float = 2.0):
+        super().__init__(similarity_threshold)
+        self.dim = dim
+        self.candidates = candidates
+        self.full_vectors_path = full_vectors_path
+        self.refit_growth = refit_growth
+        self.pca = None
+        self.fitted_rows = 0      # corpus size at the last fit
+        self.rows = 0             # rows written to full_vectors_path
+        self.vector_dim = None
+        self.reduced = np.empty((0, 0), dtype=np.float32)
+        self.full = None
+
+        os.makedirs(os.path.dirname(full_vectors_path) or ".", exist_ok=True)
+        open(full_vectors_path, "wb").close()
+
+    @staticmethod
+    def _normalize(vecs: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        return vecs / np.maximum(norms, 1e-12)
+
+    def add(self, embeddings: List[List[float]], chunks: List[Dict]):
+        if not len(embeddings):
+            return
+        vecs = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        if self.vector_dim is None:
+            self.vector_dim = vecs.shape[1]
+
+        with open(self.full_vectors_path, "ab") as f:
+            f.write(vecs.tobytes())
+        self.rows += len(vecs)
+        self.full = None  # re-map on next search
+        self.chunks.extend(chunks)
+
+        if self.fitted_rows and self.rows < self.fitted_rows * self.refit_growth:
+            self.reduced = np.vstack([self.reduced, self._project(vecs)])
+
+        print(f"[VectorStore] Stored {len(vecs)} vectors")
+
+    def _map_full(self) -> np.ndarray:
+        if self.full is None:
+            self.full = np.memmap(self.full_vectors_path, dtype=np.float32,
+                                  mode="r", shape=(self.rows, self.vector_dim))
+        return self.full
+
+    def build(self):
+        full = self._map_full()
+        dim = min(self.dim, full.shape[0], full.shape[1])
+
+        # PCA needs at least two samples; below that search the full vectors
+        if full.shape[0] < 2:
+            self.pca = None
+        else:
+            from sklearn.decomposition import PCA
+            self.pca = PCA(n_components=dim).fit(full)
+
+        self.reduced = self._project(full)
+        self.fitted_rows = self.rows
+
+        if self.pca is not None:
+            print(
+                f"[ProjectedVectorStore] Fitted PCA {full.shape[1]} → {dim}"
+                f" | explained variance: {self.pca.explained_variance_ratio_.sum():.3f}"
+                f" | full vectors → {self.full_vectors_path}"
+            )
+
+    def _project(self, vecs: np.ndarray) -> np.ndarray:
+        if self.pca is None:
+            return np.asarray(vecs, dtype=np.float32)
+        return self._normalize(self.pca.transform(vecs).astype(np.float32))
+
+    def search(self, query_embedding: List[float], k: int) -> List[Dict]:
+        if not self.chunks:
+            print("[VectorStore] No vectors found")
+            return []
+
+        if len(self.reduced) != self.rows:
+            self.build()
+        full = self._map_full()
+
+        query = self._normalize(np.asarray(query_embedding, dtype=np.float32)[None, :])[0]
+
+        # 1️⃣ Coarse search on reduced vectors
+        coarse = self.reduced @ self._project(query[None, :])[0]
+        n = min(self.candidates, len(coarse))
+        cand = np.sort(np.argpartition(-coarse, n - 1)[:n])
+
+        # 2️⃣ Re-rank candidates with full vectors
+        exact = full[cand] @ query
+        order = np.argsort(-exact)
+        cand = cand[order]
+        exact = exact[order]
+
+        return [{
+            "chunk": self.chunks[i],
+            "similarity": float(score)
+        } for i, score in zip(cand[:k], exact[:k])
+            if score >= self.similarity_threshold]
+
+
+def evaluate_reduction_recall(embeddings, queries, dims=(32, 64, 128),
+                              k: int = 5, candidates: int = 50) -> List[Dict]:
+    """Recall@k of the projected store against exact full-dim search.
+
+    Reports recall both for the reduced-only ranking and after full-vector
+    re-ranking, together with the resident memory of each option. Full
+    vectors are written to a temporary directory that is removed afterwards.
+    """
+    full = ProjectedVectorStore._normalize(np.asarray(embeddings, dtype=np.float32))
+    q = ProjectedVectorStore._normalize(np.asarray(queries, dtype=np.float32))
+
+    k = min(k, len(full))
+    truth = np.argsort(-(q @ full.T), axis=1)[:, :k]
+    results = []
+
+    tmp_dir = tempfile.TemporaryDirectory()
+
+    for dim in dims:
+        dim = min(dim, *full.shape)
+        store = ProjectedVectorStore(
+            -1.0, dim=dim, candidates=candidates,
+            full_vectors_path=os.path.join(tmp_dir.name, f"vectors_{dim}.f32")
+        )
+        store.add(full, [{"id": i} for i in range(len(full))])
+        store.build()
+
+        reduced_hits = rerank_hits = 0
+        for qi, query in enumerate(q):
+            expected = set(truth[qi])
+
+            coarse = store.reduced @ store._project(query[None, :])[0]
+            reduced_hits += len(expected & set(np.argsort(-coarse)[:k]))
+
+            found = store.search(query.tolist(), k)
+            rerank_hits += len(expected & {r["chunk"]["id"] for r in found})
+
+        total = k * len(q)
+        results.append({
+            "dim": dim,
+            "recall_reduced": round(reduced_hits / total, 4),
+            "recall_reranked": round(rerank_hits / total, 4),
+            "resident_mb": round(store.reduced.nbytes / 1024 ** 2, 2),
+            "full_mb": round(full.nbytes / 1024 ** 2, 2)
+        })
+        print(f"[RecallEval] {results[-1]}")
+        store.full = None  # release the memmap before the directory goes
+
+    tmp_dir.cleanup()
+    return results
+
 # ===============================
 # 🔗 RAG SYSTEM
 # ===============================
@@ -212,30 +1342,97 @@ class RAGSystem:
     def __init__(self, config_path: str = "config.json"):
         self.config = Config(config_path)
 
-        self.loader = DocumentLoader()
-        self.chunker = TextChunker(self.config)
+        self.loader = DocumentLoader(self.config.data["pdf_cache_dir"])
         self.embedder = EmbeddingGenerator(self.config)
-        self.vector_store = VectorStore(
-            self.config.data["similarity_threshold"]
-        )
+        if self.config.data["chunking_mode"] == "semantic":
+            self.chunker = SemanticChunker(self.config, self.embedder)
+        else:
+            self.chunker = TextChunker(self.config)
+        reduction_cfg = self.config.data["reduction"]
+        if reduction_cfg["enabled"]:
+            self.vector_store = ProjectedVectorStore(
+                self.config.data["similarity_threshold"],
+                dim=reduction_cfg["dim"],
+                candidates=reduction_cfg["candidates"],
+                full_vectors_path=reduction_cfg["full_vectors_path"],
+                refit_growth=reduction_cfg["refit_growth"]
+            )
+        else:
+            self.vector_store = VectorStore(
+                self.config.data["similarity_threshold"]
+            )
+
+        dedup_cfg = self.config.data["dedup"]
+        self.deduplicator = None
+        if dedup_cfg["enabled"]:
+            self.deduplicator = ChunkDeduplicator(
+                num_perm=dedup_cfg["num_perm"],
+                bands=dedup_cfg["bands"],
+                threshold=dedup_cfg["threshold"],
+                shingle_size=dedup_cfg["shingle_size"],
+                embedding_threshold=dedup_cfg["embedding_threshold"]
+            )
+
+        server_cfg = self.config.data["embedding_server"]
+        self.embedding_server = None
+        if server_cfg["enabled"]:
+            self.embedding_server = EmbeddingBatchServer(
+                self.embedder,
+                max_batch_size=server_cfg["max_batch_size"],
+                max_wait_ms=server_cfg["max_wait_ms"]
+            )
+
+    def close(self):
+        if self.embedding_server:
+            self.embedding_server.close()
+
+    def _chunk_sections(self, sections: List[Dict], source: str) -> List[Dict]:
+        """Chunk each HTML section separately and tag chunks with its heading path."""
+        chunks = []
+        for section in sections:
+            for chunk in self.chunker.chunk_text(section["text"], source):
+                chunk["chunk_id"] = len(chunks) + 1
+                chunk["section_path"] = section["section_path"]
+                chunk["content_type"] = section["type"]
+                chunks.append(chunk)
+        return chunks
 
     def index_document(self, filepath: str):
         print(f"\n[RAG] Indexing: {filepath}")
 
-        if filepath.endswith(".txt"):
-            text = self.loader.load_text_file(filepath)
-        elif filepath.endswith(".pdf"):
-            text = self.loader.load_pdf(filepath)
+        if filepath.startswith(("http://", "https://")) or \
+                filepath.endswith((".html", ".htm")):
+            sections = self.loader.load_html(filepath)
+            if not sections:
+                raise ValueError("Document is empty")
+            chunks = self._chunk_sections(sections, filepath)
         else:
-            raise ValueError("Unsupported file type")
+            if filepath.endswith(".txt"):
+                text = self.loader.load_text_file(filepath)
+            elif filepath.endswith(".pdf"):
+                text = self.loader.load_pdf(filepath)
+            else:
+                raise ValueError("Unsupported file type")
 
-        if not text.strip():
-            raise ValueError("Document is empty")
+            if not text.strip():
+                raise ValueError("Document is empty")
 
-        chunks = self.chunker.chunk_text(text, filepath)
-        embeddings = self.embedder.generate_batch(
-            [c["text"] for c in chunks]
-        )
+            chunks = self.chunker.chunk_text(text, filepath)
+
+        if self.deduplicator:
+            chunks = self.deduplicator.dedupe(chunks)
+
+        if chunks and "embedding" in chunks[0]:
+            # Semantic chunks are pooled from their sentence embeddings
+            embeddings = [c.pop("embedding") for c in chunks]
+        else:
+            embeddings = self.embedder.generate_batch(
+                [c["text"] for c in chunks]
+            )
+        if self.deduplicator:
+            embeddings, chunks = self.deduplicator.dedupe_embeddings(
+                embeddings, chunks
+            )
 
         self.vector_store.add(embeddings, chunks)
         print(f"[RAG] Indexed {len(chunks)} chunks\n")
@@ -243,7 +1440,10 @@ class RAGSystem:
     def query(self, question: str) -> Dict:
         print(f"\n[RAG] Query: {question}")
 
-        query_emb = self.embedder.generate(question)
+        if self.embedding_server:
+            query_emb = self.embedding_server.embed(question)
+        else:
+            query_emb = self.embedder.generate(question)
         k = self.config.data["top_k"]
 
         results = self.vector_store.search(query_emb, k)
@@ -252,7 +1452,9 @@ class RAGSystem:
             return {"answer": "No relevant documents found", "sources": []}
 
         context = "\n\n".join(
-            f"[Source: {r['chunk']['source']}]\n{r['chunk']['text']}"
+            f"[Source: {r['chunk']['source']}"
+            f"{' > ' + r['chunk']['section_path'] if r['chunk'].get('section_path') else ''}]"
+            f"\n{r['chunk']['text']}"
             for r in results
         )
 
@@ -286,6 +1488,8 @@ Question: {question}
 if __name__ == "__main__":
     rag = RAGSystem("config.json")
     rag.index_document("Sample.pdf")
+    # Web pages go through the same path, chunked per heading section:
+    # rag.index_document("https://example.com/docs/page.html")
 
     result = rag.query("What is the main topic?")
     print("\n===== FINAL ANSWER =====")